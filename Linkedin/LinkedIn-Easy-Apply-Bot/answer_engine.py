@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from collections import deque
+from typing import NamedTuple
+
+from journal import JournalWriter
+
+log = logging.getLogger(__name__)
+
+
+# (keyword, answer, priority, confidence). Keywords match whole words only, and the
+# highest priority keyword found in the question wins, so specific phrases like
+# "are you legally" beat the generic "are you ". Salary and experience questions
+# rank above the self-identification ones: "years of experience with government
+# clients" is an experience question. "{salary}" is filled in from the bot settings.
+DEFAULT_RULES = [
+    ("salary", "{salary}", 95, 0.8),
+    ("how many", "1", 93, 0.6),
+    ("experience", "1", 92, 0.5),
+    ("are you legally", "Yes", 90, 0.9),
+    ("us citizen", "Yes", 90, 0.8),
+    ("sponsor", "No", 85, 0.9),
+    ("sponsorship", "No", 85, 0.9),
+    ("gender", "Male", 80, 0.9),
+    ("race", "Wish not to answer", 80, 0.9),
+    ("lgbtq", "Wish not to answer", 80, 0.9),
+    ("ethnicity", "Wish not to answer", 80, 0.9),
+    ("nationality", "Wish not to answer", 80, 0.9),
+    ("government", "I do not wish to self-identify", 80, 0.8),
+    ("do you ", "Yes", 30, 0.4),
+    ("have you ", "Yes", 30, 0.4),
+    ("are you ", "Yes", 20, 0.4),
+    ("can you", "Yes", 20, 0.4),
+]
+
+
+class Answer(NamedTuple):
+    text: str | None
+    confidence: float
+    source: str  # "qa", "rule" or "none"
+
+
+def normalize(question: str) -> str:
+    # LinkedIn repeats the label and appends "Required" and the options, keep each line once
+    lines = []
+    for line in str(question).lower().splitlines():
+        line = re.sub(r"\s+", " ", line).strip()
+        if line and line != "required" and line not in lines:
+            lines.append(line)
+    return " ".join(lines)
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton: finds every keyword in one pass over the text.
+
+    A hit only counts on word boundaries, "race" does not match "traceability".
+    """
+
+    def __init__(self, keywords) -> None:
+        self.keywords = list(keywords)
+        self.goto: list = [{}]
+        self.fail: list = [0]
+        self.out: list = [[]]
+        for index, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.out[state].append(index)
+
+        # breadth first, so a state's fail link is final before its children need it;
+        # depth one states keep their fail link to the root
+        pending = deque(self.goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, child in self.goto[state].items():
+                pending.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def find(self, text: str) -> set:
+        found = set()
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for index in self.out[state]:
+                if self._bounded(text, end, self.keywords[index]):
+                    found.add(index)
+        return found
+
+    @staticmethod
+    def _bounded(text: str, end: int, keyword: str) -> bool:
+        # a keyword edge that is a letter or digit must not run on into the surrounding word
+        start = end - len(keyword) + 1
+        if keyword[0].isalnum() and start > 0 and text[start - 1].isalnum():
+            return False
+        if keyword[-1].isalnum() and end + 1 < len(text) and text[end + 1].isalnum():
+            return False
+        return True
+
+
+class QuestionMatcher:
+    """Answers form questions: exact qa.csv hit first, then the keyword rules."""
+
+    def __init__(self, known_answers: dict, rules=DEFAULT_RULES, **values) -> None:
+        # empty cells and the old "user provided" placeholder are not real answers
+        self.known = {normalize(q): a.strip() for q, a in known_answers.items()
+                      if isinstance(a, str) and a.strip() and a.strip() != "user provided"}
+        self.rules = [(keyword.lower(), answer.format(**values), priority, confidence)
+                      for keyword, answer, priority, confidence in rules]
+        self.automaton = KeywordAutomaton([rule[0] for rule in self.rules])
+
+    def match(self, question: str) -> Answer:
+        key = normalize(question)
+        if key in self.known:
+            return Answer(self.known[key], 1.0, "qa")
+
+        hits = self.automaton.find(key)
+        if not hits:
+            return Answer(None, 0.0, "none")
+        # highest priority wins, ties go to the rule listed first
+        best = max(hits, key=lambda index: (self.rules[index][2], -index))
+        _, answer, _, confidence = self.rules[best]
+        return Answer(answer, confidence, "rule")
+
+
+class UnansweredQueue:
+    """Collects questions nobody could answer without blocking the bot.
+
+    They are appended through the shared journal so they can be answered in
+    qa.csv before the next run. Pooled bots share one queue, so each question
+    is written once per run.
+    """
+
+    def __init__(self, filename="unanswered.csv") -> None:
+        self.journal = JournalWriter.open(filename, header=["Question"], lineterminator='\n')
+        self._seen: set = set()
+        self._lock = threading.Lock()
+
+    def put(self, question: str) -> None:
+        key = normalize(question)
+        with self._lock:
+            if key in self._seen:
+                return
+            self._seen.add(key)
+        self.journal.write([key])
+
+    def flush(self) -> None:
+        self.journal.flush()
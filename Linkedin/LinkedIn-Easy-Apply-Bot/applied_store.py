@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import csv
+import io
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from journal import JournalWriter
+
+log = logging.getLogger(__name__)
+
+
+class AppliedStore:
+    """SQLite backed history of every application attempt.
+
+    Rows mirror the output csv (timestamp, jobID, job, company, attempted, result)
+    and are indexed by job id, so "already attempted?" is a single index probe
+    no matter how long the history gets. The csv stays the human readable copy;
+    only the bytes appended since the last sync are imported on startup.
+    """
+
+    def __init__(self, path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS attempts (
+                id INTEGER PRIMARY KEY,
+                timestamp TEXT,
+                job_id TEXT NOT NULL,
+                job TEXT,
+                company TEXT,
+                attempted INTEGER,
+                result INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS attempts_job_id ON attempts (job_id);
+            CREATE TABLE IF NOT EXISTS combo_stats (
+                position TEXT NOT NULL,
+                location TEXT NOT NULL,
+                pages INTEGER DEFAULT 0,
+                cards INTEGER DEFAULT 0,
+                new_jobs INTEGER DEFAULT 0,
+                easy_apply INTEGER DEFAULT 0,
+                attempts INTEGER DEFAULT 0,
+                successes INTEGER DEFAULT 0,
+                seconds REAL DEFAULT 0,
+                PRIMARY KEY (position, location)
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        # a csv re-read from the start after a rotation must not add its rows twice,
+        # stores from before this index may hold such copies already
+        if not self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'attempts_row'").fetchone():
+            self._conn.executescript("""
+                DELETE FROM attempts WHERE id NOT IN (SELECT MIN(id) FROM attempts GROUP BY timestamp, job_id);
+                CREATE UNIQUE INDEX attempts_row ON attempts (timestamp, job_id);
+            """)
+        self._conn.commit()
+
+    @classmethod
+    def for_output(cls, filename) -> AppliedStore:
+        # keep the index next to the csv it shadows: out.csv -> out.sqlite3
+        return cls(Path(filename).with_suffix(".sqlite3"))
+
+    def attempted(self, jobID) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM attempts WHERE job_id = ? LIMIT 1",
+                                     (str(jobID),)).fetchone()
+        return row is not None
+
+    def mark_synced(self, csv_offset: int) -> None:
+        # everything up to csv_offset is already in the store
+        with self._lock:
+            self._set_meta("csv_offset", str(csv_offset))
+            self._conn.commit()
+
+    def add(self, row: list, csv_offset: int | None = None) -> None:
+        timestamp, jobID, job, company, attempted, result = row
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO attempts (timestamp, job_id, job, company, attempted, result) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (timestamp, str(jobID), job, company, int(bool(attempted)), int(bool(result))))
+            if csv_offset is not None:
+                self._set_meta("csv_offset", str(csv_offset))
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM attempts").fetchone()[0]
+
+    def sync_csv(self, filename) -> int:
+        """Import rows appended to the output csv since the last sync."""
+        if not os.path.isfile(filename):
+            return 0
+        with self._lock:
+            offset = int(self._get_meta("csv_offset") or 0)
+            size = os.path.getsize(filename)
+            if size < offset:
+                # csv was truncated or replaced, the store keeps what it has and skips the rows it knows
+                log.info(f"{filename} shrank since last sync, re-reading from the start")
+                offset = 0
+            if size == offset:
+                return 0
+            with open(filename, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+            # only import complete lines, a half written row is picked up next time
+            end = data.rfind(b'\n') + 1
+            imported = 0
+            for record in csv.reader(io.StringIO(data[:end].decode('utf-8', errors='replace'))):
+                if len(record) < 6:
+                    continue
+                timestamp, jobID, job, company, attempted, result = record[:6]
+                imported += self._conn.execute(
+                    "INSERT OR IGNORE INTO attempts (timestamp, job_id, job, company, attempted, result) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (timestamp, jobID, job, company, int(attempted == 'True'), int(result == 'True'))).rowcount
+            self._set_meta("csv_offset", str(offset + end))
+            self._conn.commit()
+        return imported
+
+    COMBO_COUNTERS = ("pages", "cards", "new_jobs", "easy_apply", "attempts", "successes", "seconds")
+
+    def combo_stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT position, location, " + ", ".join(self.COMBO_COUNTERS) + " FROM combo_stats").fetchall()
+        return {(row[0], row[1]): dict(zip(self.COMBO_COUNTERS, row[2:])) for row in rows}
+
+    def add_combo_stats(self, position, location, **deltas) -> None:
+        columns = [name for name in self.COMBO_COUNTERS if deltas.get(name)]
+        if not columns:
+            return
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO combo_stats (position, location) VALUES (?, ?)",
+                               (position, location))
+            self._conn.execute(
+                "UPDATE combo_stats SET " + ", ".join(f"{name} = {name} + ?" for name in columns) +
+                " WHERE position = ? AND location = ?",
+                [deltas[name] for name in columns] + [position, location])
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _get_meta(self, key):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+class JobClaims:
+    """Run-wide dedupe shared by every bot, so no two workers take the same jobID."""
+
+    def __init__(self, store: AppliedStore) -> None:
+        self.store = store
+        self._claimed: set = set()
+        self._lock = threading.Lock()
+
+    def claim(self, jobID) -> bool:
+        jobID = str(jobID)
+        with self._lock:
+            if jobID in self._claimed or self.store.attempted(jobID):
+                return False
+            self._claimed.add(jobID)
+            return True
+
+    def release(self, jobIDs) -> None:
+        # claimed but never applied to, so the combo's next turn can take them again
+        with self._lock:
+            self._claimed.difference_update(str(jobID) for jobID in jobIDs)
+
+
+class ResultWriter:
+    """Serializes result rows from all bots into the output csv and the store.
+
+    The store is updated right away so dedupe sees the attempt, the csv goes
+    through the shared journal and is appended in batches.
+    """
+
+    def __init__(self, filename, store: AppliedStore) -> None:
+        self.filename = filename
+        self.store = store
+        self.journal = JournalWriter.open(filename)
+        self.journal.on_flush.append(self.store.mark_synced)
+
+    def write(self, row: list) -> None:
+        self.store.add(row)
+        self.journal.write(row)
+
+    def checkpoint(self) -> None:
+        self.journal.checkpoint()
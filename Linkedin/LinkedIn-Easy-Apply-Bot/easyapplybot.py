@@ -1,36 +1,56 @@
 from __future__ import annotations
 
-import json
+import time
+
+# cold start is measured from here to the first navigation, see EasyApplyBot.__init__
+_process_start: float = time.perf_counter()
+
+import argparse
 import csv
+import json
 import logging
 import os
-import random
 import re
-import time
-from datetime import datetime, timedelta
+import sys
+import threading
+from datetime import datetime
 import getpass
 from pathlib import Path
 
-import pandas as pd
-import pyautogui
 import yaml
-from bs4 import BeautifulSoup
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-# ChromeDriverManager = ChromeDriverManager.ChromeDriverManager
+# pyautogui, bs4 and webdriver_manager are imported where they are used, they are slow to load
+
+# repository root, for the helpers shared with the Naukri bot
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.browser import DEFAULT_BLOCKED_URLS, block_resources, lean_options
+from common.checkpoint import Checkpoint
+from common.driver_cache import resolve_driver
+from common.pacing import Pacer
+from common.telemetry import Telemetry
+from common.webdriver_stats import CommandStats
+
+from answer_engine import QuestionMatcher, UnansweredQueue
+from form_engine import EasyApplyForm
+from applied_store import AppliedStore, JobClaims, ResultWriter
+from job_filter import CardFilter
+from journal import JournalWriter
+from page_scripts import HARVEST_CARDS, PROBE_LOCATORS, WAIT_FOR_PAGE
+from scheduler import ComboScheduler
+from search_cursor import SearchCursor
+from session_cache import SessionCache, add_cookies
 
 
 log = logging.getLogger(__name__)
 
+# pooled bots share one answers map, this keeps a new answer from going into qa.csv twice
+_answers_lock = threading.Lock()
+
 
 def setupLogger() -> None:
     dt: str = datetime.strftime(datetime.now(), "%m_%d_%y %H_%M_%S ")
@@ -39,20 +59,26 @@ def setupLogger() -> None:
         os.mkdir('./logs')
 
     # TODO need to check if there is a log dir available or not
-    logging.basicConfig(filename=('./logs/' + str(dt) + 'applyJobs.log'), filemode='w',
+    # the root logger, so the INFO lines of the other modules (form timings, scheduler, pacing...) get through too
+    logging.basicConfig(filename=('./logs/' + str(dt) + 'applyJobs.log'), filemode='w', level=logging.INFO,
                         format='%(asctime)s::%(name)s::%(levelname)s::%(message)s', datefmt='./logs/%d-%b-%y %H:%M:%S')
     log.setLevel(logging.DEBUG)
     c_handler = logging.StreamHandler()
     c_handler.setLevel(logging.DEBUG)
     c_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', '%H:%M:%S')
     c_handler.setFormatter(c_format)
-    log.addHandler(c_handler)
+    logging.getLogger().addHandler(c_handler)
 
 
 class EasyApplyBot:
-    setupLogger()
     # MAX_SEARCH_TIME is 10 hours by default, feel free to modify it
     MAX_SEARCH_TIME = 60 * 60
+    # elements that mean the page is usable, for the adaptive load_page
+    NO_RESULTS = ".jobs-search-no-results-banner"
+    SEARCH_PAGE_READY = ["div[data-job-id]", NO_RESULTS]
+    # reloads of a results page that could not be read before the search is left for a later turn
+    HARVEST_RETRIES = 2
+    JOB_PAGE_READY = ["button.jobs-apply-button", ".jobs-details", ".jobs-unified-top-card"]
 
     def __init__(self,
                  username,
@@ -65,7 +91,27 @@ class EasyApplyBot:
                  filename='output.csv',
                  blacklist=[],
                  blackListTitles=[],
-                 experience_level=[]
+                 blackListLocations=[],
+                 experience_level=[],
+                 page_readiness="adaptive",
+                 page_timeout=10,
+                 applied_store=None,
+                 claims=None,
+                 writer=None,
+                 pipeline=False,
+                 prefetch=25,
+                 application_timeout=120,
+                 lean_browser=False,
+                 headless=True,
+                 blocked_urls=None,
+                 session_cache="session.json",
+                 pacer=None,
+                 base_url="https://www.linkedin.com",
+                 recorder=None,
+                 telemetry=None,
+                 webdriver_stats=False,
+                 answers=None,
+                 unanswered=None
                  ) -> None:
 
         log.info("Welcome to Easy Apply Bot")
@@ -91,15 +137,62 @@ class EasyApplyBot:
         self.salary = salary
         self.rate = rate
         # self.profile_path = profile_path
-        past_ids: list | None = self.get_appliedIDs(filename)
-        self.appliedJobIDs: list = past_ids if past_ids != None else []
+        # lean mode: headless, no images and no fonts, media or trackers (see common/browser.py)
+        self.lean_browser = lean_browser
+        self.headless = lean_browser and headless
+        self.blocked_urls = DEFAULT_BLOCKED_URLS if blocked_urls is None else blocked_urls
         self.filename: str = filename
+        # base_url points the bot at a replay server (common/replay.py), the recorder saves pages for one
+        self.base_url = base_url.rstrip("/")
+        self.recorder = recorder
+        self.job_url = None
+        # timing spans and counters, a no-op unless the config names a spans or metrics file
+        self.telemetry: Telemetry = telemetry if telemetry is not None else Telemetry()
+        # every deliberate wait goes through the pacer, it slows down when LinkedIn starts pushing back
+        self.pacer: Pacer = pacer if pacer is not None else Pacer()
+        # pooled bots share one store, claim set and writer, a standalone bot makes its own
+        self.applied_store: AppliedStore = applied_store if applied_store is not None else self.get_appliedIDs(filename)
+        self.claims: JobClaims = claims if claims is not None else JobClaims(self.applied_store)
+        self.writer: ResultWriter = writer if writer is not None else ResultWriter(filename, self.applied_store)
         self.options = self.browser_options()
-        self.browser = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=self.options)
+        # timed apart from the launch, so the cold start shows whether the driver cache helped
+        resolve: float = time.perf_counter()
+        driver_path = resolve_driver()
+        resolve = time.perf_counter() - resolve
+        launch: float = time.perf_counter()
+        self.browser = self.new_browser(driver_path)
+        launch = time.perf_counter() - launch
+        # counts and times every WebDriver round trip by command and call site, off by default
+        self.driver_stats = CommandStats(self.browser) if webdriver_stats else None
         self.wait = WebDriverWait(self.browser, 30)
+        # "adaptive" waits on the DOM instead of the fixed scroll-and-sleep loop
+        self.page_readiness = page_readiness
+        self.page_timeout = page_timeout
+        self.browser.set_script_timeout(page_timeout + 5)
         self.blacklist = blacklist
         self.blackListTitles = blackListTitles
-        self.start_linkedin(username, password)
+        # rejects cards on their harvested fields, before any job page is opened
+        self.card_filter = CardFilter(self.claims, blackListTitles=blackListTitles, blacklist=blacklist,
+                                      blackListLocations=blackListLocations)
+        # pipeline: a second session keeps `prefetch` job ids queued while this one applies
+        self.pipeline = pipeline
+        self.prefetch = prefetch
+        # hard limit in seconds for one Easy Apply form, the last form's step timings stay here
+        self.application_timeout = application_timeout
+        # set by run_scheduled / applications_loop, used to feed the per-combo statistics
+        self.scheduler = None
+        self.current_combo = None
+        # the search being worked on, saved with the scheduler checkpoint
+        self.cursor = None
+        self.producer = None
+        # job ids the pipeline had queued when a time slice ran out, they go back to the scheduler
+        self.unfinished: list = []
+        self.form_timings: list = []
+        # a saved session skips the login form, it is refreshed after every full login
+        self.session_cache = SessionCache(session_cache, base_url=self.base_url) if session_cache else None
+        log.info(f"Cold start took {round(time.perf_counter() - _process_start - resolve - launch, 2)} s "
+                 f"plus {round(resolve, 2)} s to resolve ChromeDriver and {round(launch, 2)} s to launch Chrome")
+        self.login(username, password)
         self.phone_number = phone_number
         self.experience_level = experience_level
 
@@ -112,6 +205,7 @@ class EasyApplyBot:
             "upload_resume": (By.XPATH, "//*[contains(@id, 'jobs-document-upload-file-input-upload-resume')]"),
             "upload_cv": (By.XPATH, "//*[contains(@id, 'jobs-document-upload-file-input-upload-cover-letter')]"),
             "follow": (By.CSS_SELECTOR, "label[for='follow-company-checkbox']"),
+            "phone": (By.XPATH, "//input[contains(@id, 'phoneNumber')]"),
             "upload": (By.NAME, "file"),
             "search": (By.CLASS_NAME, "jobs-search-results-list"),
             "links": ("xpath", '//div[@data-job-id]'),
@@ -124,37 +218,48 @@ class EasyApplyBot:
 
         }
 
-        #initialize questions and answers file
+        #initialize questions and answers file, pooled bots share the answers and the unanswered queue
         self.qa_file = Path("qa.csv")
-        self.answers = {}
-
-        #if qa file does not exist, create it
-        if self.qa_file.is_file():
-            df = pd.read_csv(self.qa_file)
-            for index, row in df.iterrows():
-                self.answers[row['Question']] = row['Answer']
-        #if qa file does exist, load it
-        else:
-            df = pd.DataFrame(columns=["Question", "Answer"])
-            df.to_csv(self.qa_file, index=False, encoding='utf-8')
+        self.answers = answers if answers is not None else self.load_answers(self.qa_file)
+        #new answers are appended in batches, the journal creates the file with its header
+        self.qa_journal = JournalWriter.open(self.qa_file, header=["Question", "Answer"], lineterminator='\n')
 
+        # exact qa.csv answers first, keyword rules second, the rest is queued for the user
+        self.matcher = QuestionMatcher(self.answers, salary=self.salary)
+        self.unanswered = unanswered if unanswered is not None else UnansweredQueue("unanswered.csv")
 
-    def get_appliedIDs(self, filename) -> list | None:
+    @staticmethod
+    def load_answers(qa_file) -> dict:
+        answers = {}
+        #if qa file does exist, load it
+        if Path(qa_file).is_file():
+            with open(qa_file, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    answers[row['Question']] = row['Answer']
+        return answers
+
+    def get_appliedIDs(self, filename) -> AppliedStore:
+        store = AppliedStore.for_output(filename)
         try:
-            df = pd.read_csv(filename,
-                             header=None,
-                             names=['timestamp', 'jobID', 'job', 'company', 'attempted', 'result'],
-                             lineterminator='\n',
-                             encoding='utf-8')
-
-            df['timestamp'] = pd.to_datetime(df['timestamp'], format="%Y-%m-%d %H:%M:%S")
-            df = df[df['timestamp'] > (datetime.now() - timedelta(days=2))]
-            jobIDs: list = list(df.jobID)
-            log.info(f"{len(jobIDs)} jobIDs found")
-            return jobIDs
+            imported = store.sync_csv(filename)
+            if imported:
+                log.info(f"{imported} new rows imported from {filename}")
         except Exception as e:
             log.info(str(e) + "   jobIDs could not be loaded from CSV {}".format(filename))
-            return None
+        log.info(f"{store.count()} past attempts in {store.path}")
+        return store
+
+    def new_browser(self, driver_path=None):
+        # the driver path is cached per Chrome version, no network after the first run
+        browser = webdriver.Chrome(service=ChromeService(driver_path or resolve_driver()), options=self.options)
+        if self.lean_browser:
+            block_resources(browser, self.blocked_urls)
+        return browser
+
+    def share_session(self, browser) -> None:
+        # copy the logged-in cookies into another session so it can skip start_linkedin
+        browser.get(self.base_url)
+        add_cookies(browser, self.browser.get_cookies())
 
     def browser_options(self):
         options = webdriver.ChromeOptions()
@@ -166,11 +271,34 @@ class EasyApplyBot:
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_argument("--disable-webrtc")
         options.add_argument("--disable-features=WebRtcHideLocalIpsWithMdns")
+        if self.lean_browser:
+            lean_options(options, headless=self.headless)
         return options
 
+    def login(self, username, password) -> None:
+        with self.telemetry.span("login") as span:
+            if self.session_cache is None:
+                span.set(source="form")
+                self.start_linkedin(username, password)
+                return
+            if self.session_cache.restore(self.browser):
+                log.info("Logged in with the cached session")
+                span.set(source="cache")
+                return
+            # cold or expired cache: one pooled bot logs in with the form, the others wait for its session
+            with self.session_cache.login_lock():
+                if self.session_cache.restore(self.browser):
+                    log.info("Logged in with the session another worker saved")
+                    span.set(source="cache")
+                    return
+                span.set(source="form")
+                self.start_linkedin(username, password)
+                if SessionCache.is_valid(self.browser):
+                    self.session_cache.save(self.browser)
+
     def start_linkedin(self, username, password) -> None:
         log.info("Logging in.....Please wait :)  ")
-        self.browser.get("https://www.linkedin.com/login")
+        self.browser.get(self.base_url + "/login")
         try:
             # Wait for page to load
             WebDriverWait(self.browser, 10).until(
@@ -182,9 +310,9 @@ class EasyApplyBot:
             pw_field = self.browser.find_element(By.ID, "password")
             
             user_field.send_keys(username)
-            time.sleep(1)
+            self.pacer.sleep(1)
             pw_field.send_keys(password)
-            time.sleep(2)
+            self.pacer.sleep(2)
             
             # Find login button by text content
             login_button = self.browser.find_element(
@@ -193,11 +321,14 @@ class EasyApplyBot:
             )
             login_button.click()
             
-            # Handle possible 2FA
-            time.sleep(10)
-            if "checkpoint/challenge" in self.browser.current_url:
+            # Handle possible 2FA, the login page is left for the feed or a challenge
+            try:
+                WebDriverWait(self.browser, 10).until(lambda browser: "/login" not in browser.current_url)
+            except Exception:
+                pass
+            if not self.pacer.observe(self.browser.current_url):
                 log.info("2FA required - please complete authentication manually")
-                time.sleep(30)  # Give time to complete 2FA
+                self.pacer.sleep(30, adaptive=False)  # Give time to complete 2FA
             else:
                 log.info("Login successful")
             
@@ -208,111 +339,235 @@ class EasyApplyBot:
             log.info("Screenshot saved as login_error.png")
 
     def fill_data(self) -> None:
+        if self.headless:
+            return
         self.browser.set_window_size(1, 1)
         self.browser.set_window_position(2000, 2000)
 
-    def start_apply(self, positions, locations) -> None:
+    def start_apply(self, positions, locations, scheduler=None) -> None:
         start: float = time.time()
         self.fill_data()
         self.positions = positions
         self.locations = locations
-        combos: list = []
-        while len(combos) < len(positions) * len(locations):
-            position = positions[random.randint(0, len(positions) - 1)]
-            location = locations[random.randint(0, len(locations) - 1)]
-            combo: tuple = (position, location)
-            if combo not in combos:
-                combos.append(combo)
-                log.info(f"Applying to {position}: {location}")
-                location = "&location=" + location
-                self.applications_loop(position, location)
-            if len(combos) > 500:
+        if scheduler is None:
+            scheduler = ComboScheduler(self.applied_store, positions, locations,
+                                       max_search_time=self.MAX_SEARCH_TIME)
+        self.run_scheduled(scheduler)
+        scheduler.close()
+        log.info(self.card_filter.report())
+
+    def run_scheduled(self, scheduler) -> None:
+        # the scheduler picks the combo with the best yield so far and how long to stay on it
+        self.scheduler = scheduler
+        while True:
+            picked = scheduler.next_combo()
+            if picked is None:
                 break
+            position, location, start, budget = picked
+            log.info(f"Applying to {position}: {location}")
+            started: float = time.time()
+            # job ids a crashed run had selected but not applied to yet, empty on a fresh run
+            pending = scheduler.pending_jobs((position, location))
+            try:
+                with self.telemetry.span("search", position=position, location=location, start=start) as span:
+                    cursor = self.applications_loop(position, "&location=" + location, start=start, budget=budget,
+                                                    combo=(position, location), pending=pending)
+                    span.set(pages=cursor.pages, end=cursor.reason)
+            except Exception:
+                # other workers may be waiting for this combo, it goes back with its last saved progress
+                scheduler.abandon((position, location))
+                raise
+            scheduler.finish((position, location), cursor.start, time.time() - started, cursor.done,
+                             pending=self.unfinished)
+        log.info("Search yield:\n" + scheduler.report())
+        log.info(self.pacer.report())
+        if self.driver_stats is not None:
+            log.info(self.driver_stats.report())
+        # the questions nobody could answer go to unanswered.csv now, not whenever the flusher gets to them
+        self.unanswered.flush()
 
     # self.finish_apply() --> this does seem to cause more harm than good, since it closes the browser which we usually don't want, other conditions will stop the loop and just break out
 
-    def applications_loop(self, position, location):
+    def applications_loop(self, position, location, start=0, budget=None, combo=None, pending=()) -> SearchCursor:
+        # budget defaults to MAX_SEARCH_TIME, combo is the (position, location) key for the scheduler
+        budget = budget or self.MAX_SEARCH_TIME
+        self.current_combo = combo
+        self.unfinished = []
+        if self.pipeline:
+            return self.pipeline_loop(position, location, start=start, budget=budget, pending=pending)
 
         count_application = 0
         count_job = 0
-        jobs_per_page = 0
+        # steps start= by one page and ends the search on an empty or repeated page
+        cursor = SearchCursor(start=start)
+        self.cursor = cursor
         start_time: float = time.time()
+        self.apply_pending(pending)
 
         log.info("Looking for jobs.. Please wait..")
 
-        self.browser.set_window_position(1, 1)
-        self.browser.maximize_window()
-        self.browser, _ = self.next_jobs_page(position, location, jobs_per_page, experience_level=self.experience_level)
+        if not self.headless:
+            self.browser.set_window_position(1, 1)
+            self.browser.maximize_window()
+        self.browser, _ = self.next_jobs_page(position, location, cursor.start, experience_level=self.experience_level)
         log.info("Looking for jobs.. Please wait..")
 
-        while time.time() - start_time < self.MAX_SEARCH_TIME:
+        unreadable = 0
+        while time.time() - start_time < budget and not cursor.done and self.keep_going():
             try:
-                log.info(f"{(self.MAX_SEARCH_TIME - (time.time() - start_time)) // 60} minutes left in this search")
-
-                # sleep to make sure everything loads, add random to make us look human.
-                randoTime: float = random.uniform(1.5, 2.9)
-                log.debug(f"Sleeping for {round(randoTime, 1)}")
-                #time.sleep(randoTime)
-                self.load_page(sleep=0.5)
+                log.info(f"{(budget - (time.time() - start_time)) // 60} minutes left in this search")
 
                 # LinkedIn displays the search results in a scrollable <div> on the left side, we have to scroll to its bottom
-
-                # scroll to bottom
-
-                if self.is_present(self.locator["search"]):
-                    scrollresults = self.get_elements("search")
-                    #     self.browser.find_element(By.CLASS_NAME,
-                    #     "jobs-search-results-list"
-                    # )
-                    # Selenium only detects visible elements; if we scroll to the bottom too fast, only 8-9 results will be loaded into IDs list
-                    for i in range(300, 3000, 100):
-                        self.browser.execute_script("arguments[0].scrollTo(0, {})".format(i), scrollresults[0])
-                    scrollresults = self.get_elements("search")
-                    #time.sleep(1)
-
-                # get job links, (the following are actually the job card objects)
-                if self.is_present(self.locator["links"]):
-                    links = self.get_elements("links")
-                # links = self.browser.find_elements("xpath",
-                #     '//div[@data-job-id]'
-                # )
-
-                    jobIDs = {} #{Job id: processed_status}
-                
-                    # children selector is the container of the job cards on the left
-                    for link in links:
-                            if 'Applied' not in link.text: #checking if applied already
-                                if link.text not in self.blacklist: #checking if blacklisted
-                                    jobID = link.get_attribute("data-job-id")
-                                    if jobID == "search":
-                                        log.debug("Job ID not found, search keyword found instead? {}".format(link.text))
-                                        continue
-                                    else:
-                                        jobIDs[jobID] = "To be processed"
-                    if len(jobIDs) > 0:
-                        self.apply_loop(jobIDs)
-                    self.browser, jobs_per_page = self.next_jobs_page(position,
-                                                                      location,
-                                                                      jobs_per_page, 
-                                                                      experience_level=self.experience_level)
-                else:
-                    self.browser, jobs_per_page = self.next_jobs_page(position,
-                                                                      location,
-                                                                      jobs_per_page, 
-                                                                      experience_level=self.experience_level)
-
+                # Selenium only detects visible elements, so one injected script scrolls the list and reads every card
+                cards = self.harvest_job_cards()
+                if cards is None:
+                    unreadable += 1
+                    if not self.retry_harvest(unreadable, cursor.start):
+                        break
+                    self.browser, _ = self.next_jobs_page(position, location, cursor.start,
+                                                          experience_level=self.experience_level)
+                    continue
+                unreadable = 0
+                self.pacer.observe(self.browser.current_url, empty=not cards)
+                if not cursor.advance([card["jobID"] for card in cards]):
+                    break
+
+                jobIDs = self.select_jobs(cards)
+                self.record_page(cards, jobIDs)
+                self.save_progress(jobIDs, force=True)
+                if len(jobIDs) > 0:
+                    self.apply_loop(jobIDs)
+                    self.writer.checkpoint()
+                self.browser, _ = self.next_jobs_page(position,
+                                                      location,
+                                                      cursor.start,
+                                                      experience_level=self.experience_level)
 
             except Exception as e:
-                print(e)
+                log.error(f"Search page failed: {e}")
+                # whatever page the error left open (often a job view) is not the results list,
+                # so reload the results for cursor.start before the next harvest
+                try:
+                    self.browser, _ = self.next_jobs_page(position, location, cursor.start,
+                                                          experience_level=self.experience_level)
+                except Exception as e:
+                    log.error(f"Could not reload the search results, ending this search: {e}")
+                    break
+        return cursor
+
+    def apply_pending(self, pending) -> None:
+        # resumed jobs still go through the claims, the crashed run may have got to some of them
+        jobIDs = {jobID: "To be processed" for jobID in pending if self.claims.claim(jobID)}
+        if jobIDs:
+            log.info(f"Resuming with {len(jobIDs)} jobs left over from the last run")
+            self.apply_loop(jobIDs)
+
+    def save_progress(self, pending, force=False) -> None:
+        # job ids of this page not applied to yet, plus whatever the pipeline has queued
+        if self.scheduler is None or self.current_combo is None or self.cursor is None:
+            return
+        pending = list(pending)
+        if self.producer is not None:
+            pending += self.producer.queued()
+        self.scheduler.set_progress(self.current_combo, self.cursor.start, pending, force=force)
+
+    def keep_going(self) -> bool:
+        return self.scheduler is None or self.current_combo is None or self.scheduler.keep_going(self.current_combo)
+
+    def record_page(self, cards, jobIDs) -> None:
+        if self.scheduler is not None and self.current_combo is not None:
+            easy_apply = sum(1 for card in cards if card.get("easy_apply"))
+            self.scheduler.record_page(self.current_combo, len(cards), len(jobIDs), easy_apply)
+
+    def select_jobs(self, cards) -> dict:
+        jobIDs = {} #{Job id: processed_status}
+        for card in cards:
+            if self.card_filter.check(card):
+                jobIDs[card["jobID"]] = "To be processed"
+            else:
+                log.debug(f"Skipping {card.get('jobID')} ({card.get('title')}): {card['rejected']}")
+                self.telemetry.count("skipped", reason=card["rejected"])
+        return jobIDs
+
+    def harvest_job_cards(self, browser=None) -> list | None:
+        # one round trip for the whole results page: [{jobID, title, company, location, applied, easy_apply, text}]
+        # None when the page could not be read, an empty list only when LinkedIn says there are no results
+        browser = browser or self.browser
+        try:
+            with self.telemetry.span("harvest"):
+                cards = browser.execute_async_script(HARVEST_CARDS, "div[data-job-id]", ".jobs-search-results-list")
+                if not cards and not browser.find_elements(By.CSS_SELECTOR, self.NO_RESULTS):
+                    log.error(f"No job cards and no 'no results' banner on {browser.current_url}")
+                    return None
+        except Exception as e:
+            log.error(f"Could not read job cards: {e}")
+            return None
+        cards = cards or []
+        log.debug(f"{len(cards)} job cards found")
+        return cards
+
+    def retry_harvest(self, attempt, start, browser=None) -> bool:
+        # a script error, a slow render or a challenge page says nothing about the search:
+        # back off and read the same start= again, False once it is left for the combo's next turn
+        self.pacer.observe((browser or self.browser).current_url)
+        if attempt > self.HARVEST_RETRIES:
+            log.error(f"Results page at start={start} still unreadable, leaving this search for now")
+            return False
+        self.pacer.sleep(5 * attempt)
+        return True
+
+    def pipeline_loop(self, position, location, start=0, budget=None, pending=()) -> SearchCursor:
+        from pipeline import SearchProducer
+
+        budget = budget or self.MAX_SEARCH_TIME
+        producer = SearchProducer(self, position, location, maxsize=self.prefetch, start=start)
+        self.producer = producer
+        self.cursor = producer.cursor
+        producer.start()
+        start_time: float = time.time()
+        try:
+            self.apply_pending(pending)
+            while time.time() - start_time < budget and self.keep_going():
+                jobID = producer.next_job(timeout=1)
+                if jobID is None:
+                    if producer.finished():
+                        break
+                    continue
+                self.apply_loop({jobID: "To be processed"})
+        finally:
+            producer.stop()
+            # the cursor is already past their pages, so they are handed back instead of dropped
+            self.unfinished = producer.queued()
+            self.claims.release(self.unfinished)
+            self.producer = None
+            self.writer.checkpoint()
+        return producer.cursor
+
     def apply_loop(self, jobIDs):
         for jobID in jobIDs:
             if jobIDs[jobID] == "To be processed":
-                applied = self.apply_to_job(jobID)
+                if self.driver_stats is not None:
+                    self.driver_stats.begin(jobID)
+                with self.telemetry.span("application", job=jobID) as span:
+                    try:
+                        applied = self.apply_to_job(jobID)
+                    except Exception as e:
+                        # the cursor is already past this page, so one broken job must not cost the
+                        # rest of it; the next job loads its own page
+                        log.error(f"Application to {jobID} failed: {e}")
+                        applied = False
+                    span.set(applied=applied)
+                if self.driver_stats is not None:
+                    log.info(self.driver_stats.end())
+                self.telemetry.count("applications", outcome="applied" if applied else "failed")
+                if self.scheduler is not None and self.current_combo is not None:
+                    self.scheduler.record_application(self.current_combo, applied)
                 if applied:
                     log.info(f"Applied to {jobID}")
                 else:
                     log.info(f"Failed to apply to {jobID}")
-                jobIDs[jobID] == applied
+                jobIDs[jobID] = applied
+                self.save_progress(j for j, status in jobIDs.items() if status == "To be processed")
 
     def apply_to_job(self, jobID):
         # #self.avoid_lock() # annoying
@@ -321,7 +576,7 @@ class EasyApplyBot:
         self.get_job_page(jobID)
 
         # let page load
-        time.sleep(1)
+        self.pacer.sleep(1)
 
         # get easy apply button
         button = self.get_easy_apply_button()
@@ -329,7 +584,7 @@ class EasyApplyBot:
 
         # word filter to skip positions not wanted
         if button is not False:
-            if any(word in self.browser.title for word in blackListTitles):
+            if any(word in self.browser.title for word in self.blackListTitles):
                 log.info('skipping this application, a blacklisted keyword was found in the job position')
                 string_easy = "* Contains blacklisted keyword"
                 result = False
@@ -338,8 +593,6 @@ class EasyApplyBot:
                 log.info("Clicking the EASY apply button")
                 button.click()
                 clicked = True
-                time.sleep(1)
-                self.fill_out_fields()
                 result: bool = self.send_resume()
                 if result:
                     string_easy = "*Applied: Sent Resume"
@@ -374,15 +627,18 @@ class EasyApplyBot:
         company = re_extract(browserTitle.split(' | ')[1], r"(\w.*)")
 
         toWrite: list = [timestamp, jobID, job, company, attempted, result]
-        with open(self.filename, 'a+') as f:
-            writer = csv.writer(f)
-            writer.writerow(toWrite)
+        self.writer.write(toWrite)
 
     def get_job_page(self, jobID):
 
-        job: str = 'https://www.linkedin.com/jobs/view/' + str(jobID)
-        self.browser.get(job)
-        self.job_page = self.load_page(sleep=0.5)
+        job: str = self.base_url + '/jobs/view/' + str(jobID)
+        self.job_url = job
+        with self.telemetry.span("job_page"):
+            self.pacer.wait()
+            self.browser.get(job)
+            self.job_page = self.load_page(sleep=0.5, ready=self.JOB_PAGE_READY)
+        self.snapshot("job", url=job)
+        self.pacer.observe(self.browser.current_url)
         return self.job_page
 
     def get_easy_apply_button(self):
@@ -420,132 +676,44 @@ class EasyApplyBot:
 
 
     def get_elements(self, type) -> list:
-        elements = []
         element = self.locator[type]
-        if self.is_present(element):
-            elements = self.browser.find_elements(element[0], element[1])
-        return elements
+        return self.browser.find_elements(element[0], element[1])
 
     def is_present(self, locator):
         return len(self.browser.find_elements(locator[0],
                                               locator[1])) > 0
 
-    def send_resume(self) -> bool:
-        def is_present(button_locator) -> bool:
-            return len(self.browser.find_elements(button_locator[0],
-                                                  button_locator[1])) > 0
+    # locators the Easy Apply form is branched on, probed together in one script call
+    FORM_LOCATORS = ["upload_resume", "upload_cv", "phone", "follow", "submit", "error", "next", "review"]
 
+    def probe_form(self) -> dict:
+        locators = {name: list(self.locator[name]) for name in self.FORM_LOCATORS}
         try:
-            #time.sleep(random.uniform(1.5, 2.5))
-            next_locator = (By.CSS_SELECTOR,
-                            "button[aria-label='Continue to next step']")
-            review_locator = (By.CSS_SELECTOR,
-                              "button[aria-label='Review your application']")
-            submit_locator = (By.CSS_SELECTOR,
-                              "button[aria-label='Submit application']")
-            error_locator = (By.CLASS_NAME,"artdeco-inline-feedback__message")
-            upload_resume_locator = (By.XPATH, '//span[text()="Upload resume"]')
-            upload_cv_locator = (By.XPATH, '//span[text()="Upload cover letter"]')
-            # WebElement upload_locator = self.browser.find_element(By.NAME, "file")
-            follow_locator = (By.CSS_SELECTOR, "label[for='follow-company-checkbox']")
-
-            submitted = False
-            loop = 0
-            while loop < 2:
-                time.sleep(1)
-                # Upload resume
-                if is_present(upload_resume_locator):
-                    #upload_locator = self.browser.find_element(By.NAME, "file")
-                    try:
-                        resume_locator = self.browser.find_element(By.XPATH, "//*[contains(@id, 'jobs-document-upload-file-input-upload-resume')]")
-                        resume = self.uploads["Resume"]
-                        resume_locator.send_keys(resume)
-                    except Exception as e:
-                        log.error(e)
-                        log.error("Resume upload failed")
-                        log.debug("Resume: " + resume)
-                        log.debug("Resume Locator: " + str(resume_locator))
-                # Upload cover letter if possible
-                if is_present(upload_cv_locator):
-                    cv = self.uploads["Cover Letter"]
-                    cv_locator = self.browser.find_element(By.XPATH, "//*[contains(@id, 'jobs-document-upload-file-input-upload-cover-letter')]")
-                    cv_locator.send_keys(cv)
-
-                    #time.sleep(random.uniform(4.5, 6.5))
-                elif len(self.get_elements("follow")) > 0:
-                    elements = self.get_elements("follow")
-                    for element in elements:
-                        button = self.wait.until(EC.element_to_be_clickable(element))
-                        button.click()
-
-                if len(self.get_elements("submit")) > 0:
-                    elements = self.get_elements("submit")
-                    for element in elements:
-                        button = self.wait.until(EC.element_to_be_clickable(element))
-                        button.click()
-                        log.info("Application Submitted")
-                        submitted = True
-                        break
+            return self.browser.execute_script(PROBE_LOCATORS, locators)
+        except Exception as e:
+            log.debug(f"Form probe failed: {e}")
+            empty = {"count": 0, "visible": False, "enabled": False, "text": ""}
+            state = {name: dict(empty) for name in locators}
+            state["sent"] = False
+            return state
 
-                elif len(self.get_elements("error")) > 0:
-                    elements = self.get_elements("error")
-                    if "application was sent" in self.browser.page_source:
-                        log.info("Application Submitted")
-                        submitted = True
-                        break
-                    elif len(elements) > 0:
-                        while len(elements) > 0:
-                            log.info("Please answer the questions, waiting 5 seconds...")
-                            time.sleep(5)
-                            elements = self.get_elements("error")
-
-                            for element in elements:
-                                self.process_questions()
-
-                            if "application was sent" in self.browser.page_source:
-                                log.info("Application Submitted")
-                                submitted = True
-                                break
-                            elif is_present(self.locator["easy_apply_button"]):
-                                log.info("Skipping application")
-                                submitted = False
-                                break
-                        continue
-                        #add explicit wait
-                    
-                    else:
-                        log.info("Application not submitted")
-                        time.sleep(2)
-                        break
-                    # self.process_questions()
-
-                elif len(self.get_elements("next")) > 0:
-                    elements = self.get_elements("next")
-                    for element in elements:
-                        button = self.wait.until(EC.element_to_be_clickable(element))
-                        button.click()
-
-                elif len(self.get_elements("review")) > 0:
-                    elements = self.get_elements("review")
-                    for element in elements:
-                        button = self.wait.until(EC.element_to_be_clickable(element))
-                        button.click()
-
-                elif len(self.get_elements("follow")) > 0:
-                    elements = self.get_elements("follow")
-                    for element in elements:
-                        button = self.wait.until(EC.element_to_be_clickable(element))
-                        button.click()
+    def click(self, name) -> None:
+        button = self.wait.until(EC.element_to_be_clickable(self.locator[name]))
+        button.click()
 
+    def send_resume(self) -> bool:
+        form = EasyApplyForm(self, deadline=self.application_timeout)
+        try:
+            with self.telemetry.span("form"):
+                submitted = form.run()
         except Exception as e:
             log.error(e)
             log.error("cannot apply to this job")
-            pass
-            #raise (e)
-
+            submitted = False
+        self.form_timings = form.timings
         return submitted
+
     def process_questions(self):
-        time.sleep(1)
         form = self.get_elements("fields") #self.browser.find_elements(By.CLASS_NAME, "jobs-easy-apply-form-section__grouping")
         for field in form:
             question = field.text
@@ -590,70 +758,47 @@ class EasyApplyBot:
                 input = form.find_element(By.CLASS_NAME, "artdeco-text-input--input")
                 input.send_keys(answer)
 
-    def ans_question(self, question): #refactor this to an ans.yaml file
-        answer = None
-        if "how many" in question:
-            answer = "1"
-        elif "experience" in question:
-            answer = "1"
-        elif "sponsor" in question:
-            answer = "No"
-        elif 'do you ' in question:
-            answer = "Yes"
-        elif "have you " in question:
-            answer = "Yes"
-        elif "US citizen" in question:
-            answer = "Yes"
-        elif "are you " in question:
-            answer = "Yes"
-        elif "salary" in question:
-            answer = self.salary
-        elif "can you" in question:
-            answer = "Yes"
-        elif "gender" in question:
-            answer = "Male"
-        elif "race" in question:
-            answer = "Wish not to answer"
-        elif "lgbtq" in question:
-            answer = "Wish not to answer"
-        elif "ethnicity" in question:
-            answer = "Wish not to answer"
-        elif "nationality" in question:
-            answer = "Wish not to answer"
-        elif "government" in question:
-            answer = "I do not wish to self-identify"
-        elif "are you legally" in question:
-            answer = "Yes"
-        else:
-            log.info("Not able to answer question automatically. Please provide answer")
-            #open file and document unanswerable questions, appending to it
-            answer = "user provided"
-            time.sleep(15)
+    def ans_question(self, question):
+        match = self.matcher.match(question)
+        if match.text is None:
+            log.info("Not able to answer question automatically, added to unanswered.csv for qa.csv")
+            self.unanswered.put(question)
+            return "user provided"
 
-            # df = pd.DataFrame(self.answers, index=[0])
-            # df.to_csv(self.qa_file, encoding="utf-8")
-        log.info("Answering question: " + question + " with answer: " + answer)
+        answer = str(match.text)
+        log.info(f"Answering question (confidence {match.confidence}, from {match.source}): " + question + " with answer: " + answer)
 
         # Append question and answer to the CSV
-        if question not in self.answers:
-            self.answers[question] = answer
-            # Append a new question-answer pair to the CSV file
-            new_data = pd.DataFrame({"Question": [question], "Answer": [answer]})
-            new_data.to_csv(self.qa_file, mode='a', header=False, index=False, encoding='utf-8')
+        with _answers_lock:
+            new = question not in self.answers
+            if new:
+                self.answers[question] = answer
+                # Append a new question-answer pair to the CSV file
+                self.qa_journal.write([question, answer])
+        if new:
             log.info(f"Appended to QA file: '{question}' with answer: '{answer}'.")
 
         return answer
 
-    def load_page(self, sleep=1):
+    def load_page(self, sleep=1, ready=()):
+        with self.telemetry.span("load_page", mode=self.page_readiness):
+            return self._load_page(sleep, ready)
+
+    def _load_page(self, sleep=1, ready=()):
+        if self.page_readiness == "adaptive":
+            return self.wait_for_page(ready)
+
         scroll_page = 0
         while scroll_page < 4000:
             self.browser.execute_script("window.scrollTo(0," + str(scroll_page) + " );")
             scroll_page += 500
-            time.sleep(sleep)
+            self.pacer.sleep(sleep)
 
         if sleep != 1:
             self.browser.execute_script("window.scrollTo(0,0);")
-            time.sleep(sleep)
+            self.pacer.sleep(sleep)
+
+        from bs4 import BeautifulSoup
 
         # Use html.parser instead of lxml as fallback
         try:
@@ -662,27 +807,50 @@ class EasyApplyBot:
             page = BeautifulSoup(self.browser.page_source, "html.parser")
         return page
 
+    def snapshot(self, kind, url=None, step=None, browser=None) -> None:
+        # record mode only, a page_source read per page is too expensive otherwise
+        if self.recorder is not None:
+            self.recorder.record(browser or self.browser, kind, url=url, step=step)
+
+    def wait_for_page(self, ready=(), browser=None) -> None:
+        # returns as soon as one of the ready selectors exists and the DOM went quiet,
+        # page_timeout is the upper bound. Nothing reads the parsed page, so no soup here.
+        try:
+            state = (browser or self.browser).execute_async_script(WAIT_FOR_PAGE, list(ready), 300,
+                                                      int(self.page_timeout * 1000), 4000)
+            log.debug(f"Page {state['status']} after {state['elapsed']} ms")
+        except Exception as e:
+            log.debug(f"Page readiness check failed: {e}")
+
     def avoid_lock(self) -> None:
+        import pyautogui
+
         x, _ = pyautogui.position()
         pyautogui.moveTo(x + 200, pyautogui.position().y, duration=1.0)
         pyautogui.moveTo(x, pyautogui.position().y, duration=0.5)
         pyautogui.keyDown('ctrl')
         pyautogui.press('esc')
         pyautogui.keyUp('ctrl')
-        time.sleep(0.5)
+        self.pacer.sleep(0.5, adaptive=False)
         pyautogui.press('esc')
 
-    def next_jobs_page(self, position, location, jobs_per_page, experience_level=[]):
+    def search_url(self, position, location, jobs_per_page, experience_level=[]) -> str:
         # Construct the experience level part of the URL
         experience_level_str = ",".join(map(str, experience_level)) if experience_level else ""
         experience_level_param = f"&f_E={experience_level_str}" if experience_level_str else ""
-        self.browser.get(
-            # URL for jobs page
-            "https://www.linkedin.com/jobs/search/?f_LF=f_AL&keywords=" +
-            position + location + "&start=" + str(jobs_per_page) + experience_level_param)
-        #self.avoid_lock()
-        log.info("Loading next job page?")
-        self.load_page()
+        # URL for jobs page
+        return (self.base_url + "/jobs/search/?f_LF=f_AL&keywords=" +
+                position + location + "&start=" + str(jobs_per_page) + experience_level_param)
+
+    def next_jobs_page(self, position, location, jobs_per_page, experience_level=[]):
+        url = self.search_url(position, location, jobs_per_page, experience_level)
+        with self.telemetry.span("search_page", start=jobs_per_page):
+            self.pacer.wait()
+            self.browser.get(url)
+            #self.avoid_lock()
+            log.info("Loading next job page?")
+            self.load_page(ready=self.SEARCH_PAGE_READY)
+        self.snapshot("search", url=url)
         return (self.browser, jobs_per_page)
 
     # def finish_apply(self) -> None:
@@ -690,6 +858,14 @@ class EasyApplyBot:
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="LinkedIn Easy Apply bot")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue the run saved in the checkpoint file instead of starting over")
+    parser.add_argument("--record", metavar="DIR",
+                        help="save every search, job and form page to DIR for the replay server")
+    args = parser.parse_args()
+
+    setupLogger()
 
     with open("config.yaml", 'r') as stream:
         try:
@@ -715,6 +891,7 @@ if __name__ == '__main__':
     output_filename: list = output_filename[0] if len(output_filename) > 0 else 'output.csv'
     blacklist = parameters.get('blacklist', [])
     blackListTitles = parameters.get('blackListTitles', [])
+    blackListLocations = parameters.get('blackListLocations', [])
 
     uploads = {} if parameters.get('uploads', {}) is None else parameters.get('uploads', {})
     for key in uploads.keys():
@@ -723,17 +900,72 @@ if __name__ == '__main__':
     locations: list = [l for l in parameters['locations'] if l is not None]
     positions: list = [p for p in parameters['positions'] if p is not None]
 
-    bot = EasyApplyBot(parameters['username'],
-                       parameters['password'],
-                       parameters['phone_number'],
-                       parameters['salary'],
-                       parameters['rate'], 
-                       uploads=uploads,
-                       filename=output_filename,
-                       blacklist=blacklist,
-                       blackListTitles=blackListTitles,
-                       experience_level=parameters.get('experience_level', [])
-                       )
-    bot.start_apply(positions, locations)
+    # one pacer for all workers, they all use the same account
+    pacer = Pacer.from_config(parameters.get('pacing'))
+    # spans and counters go to the files named under telemetry:, shared by all workers
+    telemetry = Telemetry.from_config(parameters.get('telemetry'), labels={"bot": "linkedin"})
+    recorder = None
+    if args.record:
+        from common.replay import PageRecorder
+
+        recorder = PageRecorder(args.record)
+
+    def make_bot(**shared) -> EasyApplyBot:
+        return EasyApplyBot(parameters['username'],
+                            parameters['password'],
+                            parameters['phone_number'],
+                            parameters['salary'],
+                            parameters['rate'], 
+                            uploads=uploads,
+                            filename=output_filename,
+                            blacklist=blacklist,
+                            blackListTitles=blackListTitles,
+                            blackListLocations=blackListLocations,
+                            experience_level=parameters.get('experience_level', []),
+                            page_readiness=parameters.get('page_readiness', 'adaptive'),
+                            page_timeout=parameters.get('page_timeout', 10),
+                            pipeline=parameters.get('pipeline', False),
+                            prefetch=parameters.get('prefetch', 25),
+                            application_timeout=parameters.get('application_timeout', 120),
+                            lean_browser=parameters.get('lean_browser', False),
+                            headless=parameters.get('headless', True),
+                            blocked_urls=parameters.get('blocked_urls'),
+                            session_cache=parameters.get('session_cache', 'session.json'),
+                            pacer=pacer,
+                            base_url=parameters.get('base_url', 'https://www.linkedin.com'),
+                            recorder=recorder,
+                            telemetry=telemetry,
+                            webdriver_stats=parameters.get('webdriver_stats', False),
+                            **shared
+                            )
+
+    def make_scheduler(store) -> ComboScheduler:
+        # the checkpoint is rewritten as the run goes, --resume picks up where it stopped
+        checkpoint = Checkpoint(parameters.get('checkpoint', 'checkpoint.json'),
+                                interval=parameters.get('checkpoint_interval', 10))
+        scheduler = ComboScheduler(store, positions, locations, max_search_time=EasyApplyBot.MAX_SEARCH_TIME,
+                                   checkpoint=checkpoint)
+        if args.resume:
+            state = checkpoint.load()
+            if state is None:
+                log.info("No checkpoint to resume from, starting a new run")
+            else:
+                log.info(f"Resuming {scheduler.restore(state)} searches from {checkpoint.path}")
+        return scheduler
+
+    workers: int = parameters.get('workers', 1) or 1
+    if workers > 1:
+        from worker_pool import WorkerPool
+
+        store = AppliedStore.for_output(output_filename)
+        store.sync_csv(output_filename)
+        shared = dict(applied_store=store, claims=JobClaims(store), writer=ResultWriter(output_filename, store),
+                      answers=EasyApplyBot.load_answers("qa.csv"), unanswered=UnansweredQueue("unanswered.csv"))
+        scheduler = make_scheduler(store)
+        WorkerPool(lambda: make_bot(**shared), scheduler, workers=workers).run()
+        scheduler.close()
+    else:
+        bot = make_bot()
+        bot.start_apply(positions, locations, scheduler=make_scheduler(bot.applied_store))
 
 
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from page_scripts import FORM_STEP
+
+log = logging.getLogger(__name__)
+
+
+class EasyApplyForm:
+    """Drives one Easy Apply modal: upload -> contact -> questions -> review -> submit.
+
+    Every step reads the form through one probe, does its work and then clicks
+    the step's button inside FORM_STEP, which only returns once the form has
+    changed (or step_timeout passed). The whole application is bounded by
+    `deadline` seconds and the time spent in each state is kept in `timings`.
+    """
+
+    def __init__(self, bot, deadline: float = 120, step_timeout: float = 8) -> None:
+        self.bot = bot
+        self.deadline = deadline
+        self.step_timeout = step_timeout
+        self.timings: list = []  # [(state, seconds)]
+        self.submit_clicked = False
+
+    def classify(self, state) -> str:
+        if state["sent"]:
+            return "submitted"
+        if state["submit"]["count"]:
+            return "review"
+        if self.submit_clicked:
+            # the submit button went away after clicking it
+            return "submitted"
+        if state["upload_resume"]["count"] or state["upload_cv"]["count"]:
+            return "upload"
+        if state["phone"]["count"]:
+            return "contact"
+        if state["next"]["count"] or state["review"]["count"] or state["error"]["count"]:
+            return "questions"
+        return "closed"
+
+    def step(self, click=None, previous=None) -> dict:
+        locators = {name: list(self.bot.locator[name]) for name in self.bot.FORM_LOCATORS}
+        try:
+            return self.bot.browser.execute_async_script(FORM_STEP, locators, click, previous, 150,
+                                                         int(self.step_timeout * 1000))
+        except Exception as e:
+            log.debug(f"Form step failed: {e}")
+            return self.bot.probe_form()
+
+    def advance(self, state) -> dict:
+        # the button that leaves the current step, the order matters on the last question page
+        for name in ("submit", "review", "next"):
+            if state[name]["count"]:
+                if name == "submit":
+                    self.submit_clicked = True
+                return self.step(click=name, previous=state["signature"])
+        return self.step(previous=state["signature"])
+
+    def on_upload(self, state) -> dict:
+        for name, key in (("upload_resume", "Resume"), ("upload_cv", "Cover Letter")):
+            if state[name]["count"] and key in self.bot.uploads:
+                try:
+                    with self.bot.telemetry.span("upload", document=key):
+                        self.bot.browser.find_element(*self.bot.locator[name]).send_keys(self.bot.uploads[key])
+                except Exception as e:
+                    log.error(f"{key} upload failed: {e}")
+        return self.advance(state)
+
+    def on_contact(self, state) -> dict:
+        self.bot.fill_out_fields()
+        return self.advance(state)
+
+    def on_questions(self, state) -> dict:
+        self.bot.process_questions()
+        return self.advance(state)
+
+    def on_review(self, state) -> dict:
+        if state["follow"]["count"]:
+            self.bot.click("follow")
+        return self.advance(state)
+
+    def run(self) -> bool:
+        start: float = time.monotonic()
+        state = self.step()
+        current = self.classify(state)
+        # in record mode every state of the form is saved as the next step of the job page
+        self.bot.snapshot("form", url=self.bot.job_url, step=1)
+        while current not in ("submitted", "closed"):
+            if time.monotonic() - start > self.deadline:
+                log.info(f"Application timed out after {self.deadline} s in state {current}")
+                break
+            entered: float = time.monotonic()
+            with self.bot.telemetry.span("form_" + current):
+                state = getattr(self, "on_" + current)(state)
+            self.timings.append((current, time.monotonic() - entered))
+            self.bot.snapshot("form", url=self.bot.job_url, step=len(self.timings) + 1)
+            if state.get("timedOut"):
+                log.debug(f"Form did not change after {current}, retrying")
+            current = self.classify(state)
+
+        summary = ", ".join(f"{name} {round(seconds, 1)}s" for name, seconds in self.timings)
+        log.info(f"Easy Apply form finished as {current} in {round(time.monotonic() - start, 1)}s ({summary})")
+        return current == "submitted"
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections import Counter
+
+
+def _compile(words):
+    words = [w for w in words or [] if w]
+    if not words:
+        return None
+    return re.compile("|".join(re.escape(str(w)) for w in words), re.IGNORECASE)
+
+
+class CardFilter:
+    """Rejects job cards before their page is ever opened.
+
+    Works on the fields returned by harvest_job_cards. The counts are kept per
+    reason; apart from the cards the old loop skipped as well (UNFILTERED), every
+    rejection is one job page load (plus its load_page wait) saved.
+    """
+
+    # the card loop skipped these without a page load before the filter existed, so they save nothing
+    UNFILTERED = ("no job id", "applied on LinkedIn")
+
+    def __init__(self, claims, blackListTitles=(), blacklist=(), blackListLocations=(),
+                 easy_apply_only: bool = True) -> None:
+        self.claims = claims
+        self.titles = _compile(blackListTitles)
+        self.companies = {str(c).casefold().strip() for c in blacklist or [] if c}
+        self.locations = _compile(blackListLocations)
+        self.easy_apply_only = easy_apply_only
+        self.rejected: Counter = Counter()
+        self.accepted = 0
+        self._lock = threading.Lock()
+
+    def reject_reason(self, card) -> str | None:
+        jobID = card.get("jobID")
+        if not jobID or jobID == "search":
+            return "no job id"
+        if card.get("applied"):
+            return "applied on LinkedIn"
+        if card.get("company", "").casefold().strip() in self.companies:
+            return "blacklisted company"
+        if self.titles is not None and self.titles.search(card.get("title", "")):
+            return "blacklisted title"
+        if self.locations is not None and self.locations.search(card.get("location", "")):
+            return "blacklisted location"
+        # an empty card has not rendered yet, that says nothing about its badge
+        if self.easy_apply_only and card.get("text", "").strip() and not card.get("easy_apply"):
+            return "no Easy Apply"
+        # claimed last, so rejected cards do not use up their job id
+        if not self.claims.claim(jobID):
+            return "already attempted"
+        return None
+
+    def check(self, card) -> bool:
+        reason = self.reject_reason(card)
+        with self._lock:
+            if reason is None:
+                self.accepted += 1
+            else:
+                self.rejected[reason] += 1
+        card["rejected"] = reason
+        return reason is None
+
+    def report(self) -> str:
+        with self._lock:
+            saved = sum(count for reason, count in self.rejected.items() if reason not in self.UNFILTERED)
+            reasons = ", ".join(f"{reason}: {count}" for reason, count in self.rejected.most_common())
+            return f"Card filter saved {saved} page loads, {self.accepted} jobs opened" + (
+                f" ({reasons})" if reasons else "")
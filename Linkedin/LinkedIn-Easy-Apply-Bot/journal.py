@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import atexit
+import csv
+import io
+import logging
+import os
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+class JournalWriter:
+    """Buffered, batched csv appender.
+
+    Rows are formatted in memory and appended in one write once `batch_size` rows
+    are waiting or the oldest one is `flush_interval` seconds old. checkpoint()
+    also fsyncs. Use JournalWriter.open() so every bot in the process shares one
+    writer per file and rows from different workers never interleave.
+    """
+
+    _journals: dict = {}
+    _registry_lock = threading.Lock()
+    _flusher: threading.Thread | None = None
+
+    def __init__(self, filename, header=None, batch_size: int = 20, flush_interval: float = 5.0,
+                 encoding: str = 'utf-8', lineterminator: str = '\r\n') -> None:
+        self.filename = str(filename)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.encoding = encoding
+        self.lineterminator = lineterminator
+        self.on_flush = []  # callbacks receiving the file size after each flush
+        self._buffer: list = []
+        self._oldest: float | None = None
+        self._lock = threading.Lock()
+        if header and (not os.path.isfile(self.filename) or os.path.getsize(self.filename) == 0):
+            self._buffer.append(self._format(header))
+            self.flush()
+
+    @classmethod
+    def open(cls, filename, **kwargs) -> JournalWriter:
+        key = os.path.abspath(str(filename))
+        with cls._registry_lock:
+            journal = cls._journals.get(key)
+            if journal is None:
+                journal = cls._journals[key] = cls(filename, **kwargs)
+            if cls._flusher is None:
+                cls._flusher = threading.Thread(target=cls._flush_loop, name="journal-flusher", daemon=True)
+                cls._flusher.start()
+                atexit.register(cls.close_all)
+        return journal
+
+    def _format(self, row) -> str:
+        out = io.StringIO()
+        csv.writer(out, lineterminator=self.lineterminator).writerow(row)
+        return out.getvalue()
+
+    def write(self, row) -> None:
+        with self._lock:
+            self._buffer.append(self._format(row))
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def due(self) -> bool:
+        oldest = self._oldest
+        return oldest is not None and time.monotonic() - oldest >= self.flush_interval
+
+    def flush(self, fsync: bool = False) -> None:
+        with self._lock:
+            if self._buffer:
+                with open(self.filename, 'a', encoding=self.encoding, newline='') as f:
+                    f.write("".join(self._buffer))
+                    f.flush()
+                    if fsync:
+                        os.fsync(f.fileno())
+                self._buffer = []
+                self._oldest = None
+                size = os.path.getsize(self.filename)
+                for callback in self.on_flush:
+                    callback(size)
+            elif fsync and os.path.isfile(self.filename):
+                with open(self.filename, 'a') as f:
+                    os.fsync(f.fileno())
+
+    def checkpoint(self) -> None:
+        self.flush(fsync=True)
+
+    def close(self) -> None:
+        try:
+            self.checkpoint()
+        except Exception as e:
+            log.error(f"Could not flush {self.filename}: {e}")
+
+    @classmethod
+    def _flush_loop(cls) -> None:
+        while True:
+            time.sleep(0.5)
+            with cls._registry_lock:
+                journals = list(cls._journals.values())
+            for journal in journals:
+                if journal.due():
+                    try:
+                        journal.flush()
+                    except Exception as e:
+                        log.error(f"Could not flush {journal.filename}: {e}")
+
+    @classmethod
+    def close_all(cls) -> None:
+        with cls._registry_lock:
+            journals = list(cls._journals.values())
+        for journal in journals:
+            journal.close()
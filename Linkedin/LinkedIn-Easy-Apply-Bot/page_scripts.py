@@ -0,0 +1,185 @@
+# JavaScript snippets injected through execute_script / execute_async_script.
+# Each one replaces a series of WebDriver round trips with a single call.
+
+# arguments: ready selectors, quiet period (ms), timeout (ms), max scroll (px), callback
+# Resolves once one of the selectors exists, the page has been scrolled down to
+# trigger lazy loading and the DOM has stopped changing for the quiet period.
+WAIT_FOR_PAGE = """
+var selectors = arguments[0], quietMs = arguments[1], timeoutMs = arguments[2],
+    maxScroll = arguments[3], done = arguments[arguments.length - 1];
+var start = performance.now(), lastChange = start, finished = false;
+var observer = new MutationObserver(function () { lastChange = performance.now(); });
+observer.observe(document.documentElement, {childList: true, subtree: true});
+
+function found() {
+    if (!selectors.length) return true;
+    return selectors.some(function (s) { return document.querySelector(s) !== null; });
+}
+function scrolledOut() {
+    var bottom = window.scrollY + window.innerHeight;
+    return bottom >= document.documentElement.scrollHeight - 2 || window.scrollY >= maxScroll;
+}
+function finish(status) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(timer);
+    window.scrollTo(0, 0);
+    done({status: status, elapsed: Math.round(performance.now() - start)});
+}
+var timer = setInterval(function () {
+    var now = performance.now();
+    if (now - start > timeoutMs) return finish('timeout');
+    if (document.readyState === 'loading' || !found()) return;
+    if (!scrolledOut()) {
+        // every step pulls in lazy content, which resets the quiet timer
+        window.scrollBy(0, window.innerHeight);
+        lastChange = now;
+        return;
+    }
+    if (now - lastChange >= quietMs) finish('ready');
+}, 50);
+"""
+
+# arguments: card selector, results list selector, callback
+# Scrolls the results list so every card renders, then returns one record per card.
+# Cards are read while scrolling because LinkedIn only fills them in once visible.
+HARVEST_CARDS = """
+var cardSelector = arguments[0], listSelector = arguments[1],
+    done = arguments[arguments.length - 1];
+var cards = {}, order = [];
+
+function text(card, selectors) {
+    for (var i = 0; i < selectors.length; i++) {
+        var el = card.querySelector(selectors[i]);
+        if (el && el.innerText.trim()) return el.innerText.trim().split('\\n')[0];
+    }
+    return '';
+}
+function collect() {
+    document.querySelectorAll(cardSelector).forEach(function (card) {
+        var id = card.getAttribute('data-job-id');
+        if (!id) return;
+        var body = card.innerText || '';
+        if (!(id in cards)) order.push(id);
+        if (id in cards && !body.trim()) return;
+        cards[id] = {
+            jobID: id,
+            title: text(card, ['.job-card-list__title', '.job-card-container__link', 'a[href*="/jobs/view/"]']),
+            company: text(card, ['.job-card-container__primary-description', '.artdeco-entity-lockup__subtitle',
+                                 '.job-card-container__company-name']),
+            location: text(card, ['.job-card-container__metadata-item', '.artdeco-entity-lockup__caption']),
+            applied: /(^|\\n)\\s*Applied\\b/.test(body),
+            easy_apply: body.indexOf('Easy Apply') !== -1,
+            text: body
+        };
+    });
+}
+var list = document.querySelector(listSelector);
+if (!list) {
+    var first = document.querySelector(cardSelector);
+    list = first ? first.closest('ul') && first.closest('ul').parentElement : null;
+}
+var position = 0;
+function step() {
+    collect();
+    if (!list || position >= list.scrollHeight) {
+        if (list) list.scrollTo(0, 0);
+        done(order.map(function (id) { return cards[id]; }));
+        return;
+    }
+    position += 300;
+    list.scrollTo(0, position);
+    setTimeout(step, 60);
+}
+step();
+"""
+
+# probe(locators) -> {name: {count, visible, enabled, text}, sent, signature}
+# locators is {name: [by, value]} using selenium's By strings. "sent" tells whether the
+# "application was sent" confirmation is shown, "signature" changes whenever the
+# Easy Apply form moves to another step.
+_PROBE_FUNCTION = """
+function find(by, value) {
+    switch (by) {
+        case 'css selector': return Array.from(document.querySelectorAll(value));
+        case 'class name': return Array.from(document.getElementsByClassName(value));
+        case 'id': var el = document.getElementById(value); return el ? [el] : [];
+        case 'name': return Array.from(document.getElementsByName(value));
+        case 'tag name': return Array.from(document.getElementsByTagName(value));
+        case 'xpath':
+            var result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+            return nodes;
+    }
+    return [];
+}
+function probe(locators) {
+    var state = {}, signature = [];
+    Object.keys(locators).forEach(function (name) {
+        var elements = [];
+        try { elements = find(locators[name][0], locators[name][1]); } catch (e) {}
+        var first = elements[0];
+        state[name] = {
+            count: elements.length,
+            visible: elements.some(function (el) { return el.getClientRects().length > 0; }),
+            enabled: !!first && !first.disabled && first.getAttribute('aria-disabled') !== 'true',
+            text: first ? (first.innerText || first.value || '').trim().slice(0, 200) : ''
+        };
+        signature.push(name + ':' + elements.length);
+    });
+    state.sent = document.body ? document.body.innerText.indexOf('application was sent') !== -1 : false;
+    var heading = document.querySelector('.jobs-easy-apply-modal h3, .jobs-easy-apply-content h3');
+    var progress = document.querySelector('.jobs-easy-apply-modal [role="progressbar"], .jobs-easy-apply-modal progress');
+    signature.push(heading ? heading.innerText.trim() : '');
+    signature.push(progress ? (progress.getAttribute('aria-valuenow') || progress.value || '') : '');
+    signature.push(state.sent);
+    state.signature = signature.join('|');
+    return state;
+}
+"""
+
+# arguments: locators
+PROBE_LOCATORS = _PROBE_FUNCTION + """
+return probe(arguments[0]);
+"""
+
+# arguments: locators, name of the locator to click (or null), previous signature (or null),
+#            quiet period (ms), timeout (ms), callback
+# Clicks, then resolves with a fresh probe once the form signature differs from the
+# previous one and the DOM has been quiet for the quiet period. Without a previous
+# signature it waits for any of the locators to show up. On timeout the probe is
+# returned with timedOut set, so a stuck step costs one bounded wait.
+FORM_STEP = _PROBE_FUNCTION + """
+var locators = arguments[0], clickName = arguments[1], previous = arguments[2],
+    quietMs = arguments[3], timeoutMs = arguments[4], done = arguments[arguments.length - 1];
+var start = performance.now(), lastChange = start, finished = false;
+var observer = new MutationObserver(function () { lastChange = performance.now(); });
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+
+if (clickName) {
+    var target = find(locators[clickName][0], locators[clickName][1])[0];
+    if (target) target.click();
+}
+function arrived(state) {
+    if (previous === null) {
+        return Object.keys(locators).some(function (name) { return state[name].count > 0; });
+    }
+    return state.signature !== previous;
+}
+function finish(state, timedOut) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(timer);
+    state.timedOut = timedOut;
+    state.elapsed = Math.round(performance.now() - start);
+    done(state);
+}
+var timer = setInterval(function () {
+    var now = performance.now(), state = probe(locators);
+    if (now - start > timeoutMs) return finish(state, true);
+    if (arrived(state) && now - lastChange >= quietMs) finish(state, false);
+}, 50);
+"""
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+
+from search_cursor import SearchCursor
+
+log = logging.getLogger(__name__)
+
+
+class SearchProducer(threading.Thread):
+    """Walks the search result pages in a second browser session.
+
+    Selected job ids go into a bounded queue that the applying bot drains, so the
+    next results page is already loaded while the current job is being applied to.
+    """
+
+    def __init__(self, bot, position, location, maxsize: int = 25, start: int = 0) -> None:
+        super().__init__(name="search-producer", daemon=True)
+        self.bot = bot
+        self.position = position
+        self.location = location
+        self.jobs: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+        self._stop_event = threading.Event()
+        self.browser = None
+        self.cursor = SearchCursor(start=start)
+        # selected on the last page but not in the queue yet, so a checkpoint does not lose them
+        self.backlog: list = []
+
+    def run(self) -> None:
+        try:
+            self.browser = self.bot.new_browser()
+            self.bot.share_session(self.browser)
+            cursor = self.cursor
+            unreadable = 0
+            while not self._stop_event.is_set() and self.bot.keep_going():
+                url = self.bot.search_url(self.position, self.location, cursor.start,
+                                          experience_level=self.bot.experience_level)
+                self.bot.pacer.wait()
+                self.browser.get(url)
+                self.bot.wait_for_page(self.bot.SEARCH_PAGE_READY, browser=self.browser)
+                self.bot.snapshot("search", url=url, browser=self.browser)
+                cards = self.bot.harvest_job_cards(browser=self.browser)
+                if cards is None:
+                    # reload the same page, the cursor only moves on a page that could be read
+                    unreadable += 1
+                    if not self.bot.retry_harvest(unreadable, cursor.start, browser=self.browser):
+                        break
+                    continue
+                unreadable = 0
+                self.bot.pacer.observe(self.browser.current_url, empty=not cards)
+                page_start = cursor.start
+                if not cursor.advance([card["jobID"] for card in cards]):
+                    break
+                jobIDs = self.bot.select_jobs(cards)
+                self.bot.record_page(cards, jobIDs)
+                log.debug(f"Queued {len(jobIDs)} of {len(cards)} jobs from start={page_start}")
+                self.backlog = list(jobIDs)
+                while self.backlog:
+                    if not self._put(self.backlog[0]):
+                        return
+                    self.backlog.pop(0)
+        except Exception as e:
+            log.error(f"Search producer stopped: {e}")
+        finally:
+            self._close_browser()
+
+    def _put(self, jobID) -> bool:
+        # block while the queue is full, but keep an eye on stop()
+        while not self._stop_event.is_set():
+            try:
+                self.jobs.put(jobID, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def queued(self) -> list:
+        with self.jobs.mutex:
+            queued = list(self.jobs.queue)
+        return queued + [jobID for jobID in self.backlog if jobID not in queued]
+
+    def next_job(self, timeout: float = 1):
+        try:
+            return self.jobs.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def finished(self) -> bool:
+        return not self.is_alive() and self.jobs.empty()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout=10)
+        self._close_browser()
+
+    def _close_browser(self) -> None:
+        if self.browser is not None:
+            try:
+                self.browser.quit()
+            except Exception:
+                pass
+            self.browser = None
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import logging
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class ComboScheduler:
+    """Hands out position x location combos, best expected yield first.
+
+    Yield is successful applications per hour spent on a combo, taken from the
+    running counters in the results store and smoothed with a prior so that
+    untried combos get a turn. Each turn gets a time slice that grows with the
+    combo's yield; a combo is dropped for the run once its search is exhausted
+    or `dry_pages` pages in a row brought no new jobs. Combos that still have
+    results come back with their page offset once the others had their turn.
+
+    With a checkpoint the whole state, including the job ids of the page being
+    worked on, is saved as it changes so that a crashed run can be resumed.
+    """
+
+    def __init__(self, store, positions, locations, max_search_time: float = 60 * 60,
+                 min_slice: float = 5 * 60, dry_pages: int = 3, prior_rate: float = 6.0,
+                 prior_hours: float = 0.5, checkpoint=None) -> None:
+        self.store = store
+        self.max_search_time = max_search_time
+        self.min_slice = min_slice
+        self.dry_pages = dry_pages
+        self.prior_rate = prior_rate  # successes per hour assumed for an untried combo
+        self.prior_hours = prior_hours
+        self.checkpoint = checkpoint
+        self._lock = threading.Lock()
+        # signalled whenever a turn ends, a worker with nothing to pick waits on it
+        self._turn_ended = threading.Condition(self._lock)
+        self._history = store.combo_stats()
+        self.combos: dict = {}
+        for position in positions:
+            for location in locations:
+                self.combos[(position, location)] = {"start": 0, "dry": 0, "done": False,
+                                                     "running": False, "spent": 0.0, "pending": []}
+        # the old loop gave every combo MAX_SEARCH_TIME, that stays the ceiling for the run
+        self.run_budget = max_search_time * len(self.combos)
+        self.run_spent = 0.0
+
+    def yield_rate(self, combo) -> float:
+        stats = self._history.get(combo, {})
+        hours = stats.get("seconds", 0) / 3600
+        return (stats.get("successes", 0) + self.prior_rate * self.prior_hours) / (hours + self.prior_hours)
+
+    def next_combo(self):
+        """(position, location, start offset, time slice in seconds) or None when the run is over.
+
+        While the only open combos are running on other workers this waits for one
+        of them to come back unfinished, rather than leaving the pool a worker short.
+        """
+        with self._lock:
+            while True:
+                if self.run_spent >= self.run_budget:
+                    return None
+                ready = [combo for combo, state in self.combos.items()
+                         if not state["done"] and not state["running"]]
+                if ready:
+                    break
+                if not any(state["running"] for state in self.combos.values()):
+                    return None
+                self._turn_ended.wait()
+            # a resumed search with jobs left goes first, then least time this run,
+            # so every combo is tried before the best ones repeat
+            ready.sort(key=lambda combo: (not self.combos[combo]["pending"], self.combos[combo]["spent"] > 0,
+                                          -self.yield_rate(combo)))
+            combo = ready[0]
+            rates = [self.yield_rate(c) for c in self.combos if not self.combos[c]["done"]]
+            average = sum(rates) / len(rates)
+            share = self.yield_rate(combo) / average if average else 1
+            budget = min(self.max_search_time, max(self.min_slice, share * self.max_search_time / 2),
+                         self.run_budget - self.run_spent)
+            state = self.combos[combo]
+            state["running"] = True
+            log.info(f"Scheduling {combo[0]}: {combo[1]} for {round(budget / 60)} minutes from start={state['start']} "
+                     f"(yield {round(self.yield_rate(combo), 1)} applications/hour)")
+            return combo[0], combo[1], state["start"], budget
+
+    def record_page(self, combo, cards, new_jobs, easy_apply) -> None:
+        with self._lock:
+            state = self.combos.get(combo)
+            if state is not None:
+                state["dry"] = 0 if new_jobs else state["dry"] + 1
+            self._add(combo, pages=1, cards=cards, new_jobs=new_jobs, easy_apply=easy_apply)
+
+    def record_application(self, combo, success: bool) -> None:
+        with self._lock:
+            self._add(combo, attempts=1, successes=int(bool(success)))
+
+    def keep_going(self, combo) -> bool:
+        with self._lock:
+            state = self.combos.get(combo)
+            return state is None or state["dry"] < self.dry_pages
+
+    def finish(self, combo, start: int, seconds: float, exhausted: bool, pending=()) -> None:
+        """Ends a turn; pending are the selected job ids it had no time for, applied to first next turn."""
+        with self._lock:
+            state = self.combos[combo]
+            state["running"] = False
+            state["start"] = start
+            state["spent"] += seconds
+            state["pending"] = list(pending)
+            if (exhausted or state["dry"] >= self.dry_pages) and not state["pending"]:
+                state["done"] = True
+            self.run_spent += seconds
+            self._add(combo, seconds=seconds)
+            self._save(force=True)
+            self._turn_ended.notify_all()
+
+    def abandon(self, combo) -> None:
+        """Hands back a combo whose worker failed, it keeps its offset and pending jobs for the next turn."""
+        with self._lock:
+            state = self.combos.get(combo)
+            if state is not None:
+                state["running"] = False
+            self._save(force=True)
+            self._turn_ended.notify_all()
+
+    def set_progress(self, combo, start: int, pending, force: bool = False) -> None:
+        """Where a running combo stands: the next page offset and the job ids not applied to yet."""
+        with self._lock:
+            state = self.combos.get(combo)
+            if state is None:
+                return
+            state["start"] = start
+            state["pending"] = list(pending)
+            self._save(force=force)
+
+    def pending_jobs(self, combo) -> list:
+        # job ids left over from a resumed run, they stay checkpointed until set_progress replaces them
+        with self._lock:
+            state = self.combos.get(combo)
+            return list(state["pending"]) if state is not None else []
+
+    def _state(self) -> dict:
+        return {
+            "run_spent": self.run_spent,
+            "combos": [{"position": combo[0], "location": combo[1],
+                        **{key: value for key, value in state.items() if key != "running"}}
+                       for combo, state in self.combos.items()],
+        }
+
+    def restore(self, state: dict) -> int:
+        """Takes over a checkpointed run, combos no longer in the config are ignored."""
+        restored = 0
+        with self._lock:
+            self.run_spent = state.get("run_spent", 0.0)
+            for saved in state.get("combos", []):
+                current = self.combos.get((saved.get("position"), saved.get("location")))
+                if current is None:
+                    continue
+                for key in ("start", "dry", "done", "spent", "pending"):
+                    if key in saved:
+                        current[key] = saved[key]
+                restored += 1
+        return restored
+
+    def close(self) -> None:
+        # a combo still running or open with budget left belongs to a worker that died, keep it resumable
+        if self.checkpoint is None:
+            return
+        with self._lock:
+            unfinished = self.run_spent < self.run_budget and any(not state["done"] for state in self.combos.values())
+            if unfinished or any(state["running"] or state["pending"] for state in self.combos.values()):
+                self._save(force=True)
+            else:
+                self.checkpoint.clear()
+
+    def _save(self, force: bool = False) -> None:
+        if self.checkpoint is not None:
+            self.checkpoint.save(self._state(), force=force)
+
+    def report(self) -> str:
+        with self._lock:
+            lines = []
+            for combo, state in self.combos.items():
+                stats = self._history.get(combo, {})
+                easy_ratio = stats.get("easy_apply", 0) / stats["cards"] if stats.get("cards") else 0
+                success_rate = stats.get("successes", 0) / stats["attempts"] if stats.get("attempts") else 0
+                per_page = stats.get("new_jobs", 0) / stats["pages"] if stats.get("pages") else 0
+                lines.append(f"{combo[0]}: {combo[1]}: {round(state['spent'] / 60, 1)} min this run, "
+                             f"{round(per_page, 1)} new jobs/page, {round(easy_ratio * 100)}% Easy Apply, "
+                             f"{round(success_rate * 100)}% success, {round(self.yield_rate(combo), 1)} applications/hour")
+            return "\n".join(lines)
+
+    def _add(self, combo, **deltas) -> None:
+        stats = self._history.setdefault(combo, {})
+        for name, value in deltas.items():
+            stats[name] = stats.get(name, 0) + value
+        self.store.add_combo_stats(combo[0], combo[1], **deltas)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class SearchCursor:
+    """Walks the `start=` offset of one search and notices when it runs dry.
+
+    LinkedIn serves `page_size` cards per page and keeps answering past the last
+    result, usually with an empty list or the last page again, so each page's job
+    id set is fingerprinted and the search ends on the first empty or repeated page.
+    """
+
+    def __init__(self, page_size: int = 25, start: int = 0) -> None:
+        self.page_size = page_size
+        self.start = start
+        self.pages = 0
+        self.done = False
+        self.reason: str | None = None
+        self._seen: set = set()
+
+    def advance(self, jobIDs) -> bool:
+        """Records the page just read; False once the search is exhausted."""
+        fingerprint = frozenset(jobIDs)
+        if not fingerprint:
+            self.finish("empty page")
+        elif fingerprint in self._seen:
+            self.finish("repeated page")
+        else:
+            self._seen.add(fingerprint)
+            self.pages += 1
+            self.start += self.page_size
+        return not self.done
+
+    def finish(self, reason: str) -> None:
+        self.done = True
+        self.reason = reason
+        log.info(f"Search exhausted at start={self.start} after {self.pages} pages: {reason}")
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+BASE_URL = "https://www.linkedin.com"
+
+# cheap same-origin page, cookies can only be set for the domain the browser is on
+COOKIE_LANDING_PATH = "/robots.txt"
+
+# arguments: callback. One HEAD request with the session cookies: a logged-out
+# session is redirected to the login page, a logged-in one gets the feed.
+CHECK_SESSION = """
+var done = arguments[arguments.length - 1];
+fetch('/feed/', {method: 'HEAD', credentials: 'include', redirect: 'manual'})
+    .then(function (response) { done(response.type !== 'opaqueredirect' && response.ok); })
+    .catch(function () { done(false); });
+"""
+
+
+# one lock per cache file, shared by every bot in the process
+_login_locks: dict = {}
+_login_locks_guard = threading.Lock()
+
+
+def add_cookies(browser, cookies) -> int:
+    added = 0
+    for cookie in cookies:
+        cookie = dict(cookie)
+        # chrome rejects some sameSite values it hands out itself
+        cookie.pop("sameSite", None)
+        try:
+            browser.add_cookie(cookie)
+            added += 1
+        except Exception as e:
+            log.debug(f"Could not restore cookie {cookie.get('name')}: {e}")
+    return added
+
+
+class SessionCache:
+    """Cookies and localStorage of a logged-in LinkedIn session, kept in a json file.
+
+    The file holds live session cookies, so it is written user-readable only.
+    Pooled bots share the file: login_lock() lets the first one log in with the
+    form while the others wait and then restore the session it saved.
+    """
+
+    def __init__(self, path="session.json", max_age: float = 7 * 24 * 60 * 60, base_url: str = BASE_URL) -> None:
+        self.path = str(path)
+        self.max_age = max_age
+        self.base_url = base_url
+
+    def save(self, browser) -> None:
+        try:
+            state = {
+                "saved_at": time.time(),
+                "cookies": browser.get_cookies(),
+                "local_storage": browser.execute_script("return Object.assign({}, window.localStorage);"),
+            }
+            # a tmp file of its own per writer, mkstemp creates it user-readable only
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)),
+                                       prefix=os.path.basename(self.path) + ".", suffix=".tmp")
+            try:
+                with open(fd, 'w') as f:
+                    json.dump(state, f)
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.remove(tmp)
+                raise
+            log.info(f"Saved LinkedIn session to {self.path}")
+        except Exception as e:
+            log.error(f"Could not save the LinkedIn session: {e}")
+
+    def login_lock(self) -> threading.Lock:
+        with _login_locks_guard:
+            return _login_locks.setdefault(os.path.abspath(self.path), threading.Lock())
+
+    def load(self) -> dict | None:
+        if not os.path.isfile(self.path):
+            return None
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except Exception as e:
+            log.info(f"Ignoring unreadable session cache {self.path}: {e}")
+            return None
+        if time.time() - state.get("saved_at", 0) > self.max_age:
+            log.info("Cached LinkedIn session is too old")
+            return None
+        return state
+
+    def restore(self, browser) -> bool:
+        state = self.load()
+        if state is None:
+            return False
+        browser.get(self.base_url + COOKIE_LANDING_PATH)
+        add_cookies(browser, state.get("cookies", []))
+        if state.get("local_storage"):
+            browser.execute_script(
+                "var items = arguments[0]; for (var key in items) { window.localStorage.setItem(key, items[key]); }",
+                state["local_storage"])
+        if self.is_valid(browser):
+            return True
+        log.info("Cached LinkedIn session has expired")
+        return False
+
+    @staticmethod
+    def is_valid(browser) -> bool:
+        try:
+            return bool(browser.execute_async_script(CHECK_SESSION))
+        except Exception as e:
+            log.debug(f"Session check failed: {e}")
+            return False
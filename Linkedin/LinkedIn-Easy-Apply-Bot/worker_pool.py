@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+class WorkerPool:
+    """Runs position x location combos on several isolated browser sessions.
+
+    make_bot builds one logged-in EasyApplyBot per worker; all bots must share the
+    same JobClaims, ResultWriter, answers map and UnansweredQueue so dedupe and
+    output stay consistent, and take their combos from the one ComboScheduler.
+    A worker with no combo to pick waits while the others still have one running. The workers start side by side, but
+    a cold session cache is filled by one login form, the rest restore from it.
+    """
+
+    def __init__(self, make_bot, scheduler, workers: int = 2) -> None:
+        self.make_bot = make_bot
+        self.scheduler = scheduler
+        self.workers = max(1, int(workers))
+
+    def run(self) -> None:
+        start: float = time.time()
+        count = min(self.workers, len(self.scheduler.combos))
+        threads = [threading.Thread(target=self.work, name=f"worker-{i + 1}", daemon=True)
+                   for i in range(count)]
+        log.info(f"Starting {count} workers for {len(self.scheduler.combos)} searches")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        log.info(f"All searches finished in {round((time.time() - start) / 60, 1)} minutes")
+
+    def work(self) -> None:
+        try:
+            bot = self.make_bot()
+        except Exception as e:
+            log.error(f"{threading.current_thread().name} could not start a browser: {e}")
+            return
+
+        try:
+            bot.fill_data()
+            # the scheduler is shared, so workers take turns on the combos with the best yield
+            try:
+                bot.run_scheduled(self.scheduler)
+            except Exception as e:
+                log.error(f"{threading.current_thread().name} stopped: {e}")
+            log.info(f"{threading.current_thread().name}: {bot.card_filter.report()}")
+        finally:
+            try:
+                bot.browser.quit()
+            except Exception:
+                pass
@@ -0,0 +1,2 @@
+# Helpers shared by the LinkedIn and Naukri bots. Both scripts put the repository
+# root on sys.path so this package imports the same way from either folder.
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from common.pacing import Pacer
+from common.replay import ReplayServer
+from common.webdriver_stats import format_report
+
+log = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parents[1]
+LINKEDIN_DIR = ROOT / "Linkedin" / "LinkedIn-Easy-Apply-Bot"
+NAUKRI_DIR = ROOT / "naukari" / "Naukari-Easy-Apply-Bot"
+
+
+def percentile(values, p: float) -> float:
+    # nearest rank, good enough for a few dozen jobs
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))]
+
+
+def summarize(name: str, jobs: list, elapsed: float, server: ReplayServer, webdriver: dict | None = None) -> str:
+    """jobs: [{"seconds", "calls", "applied"}], elapsed: seconds of the whole search + apply phase."""
+    seconds = [job["seconds"] for job in jobs]
+    calls = sum(job["calls"] for job in jobs)
+    applied = sum(1 for job in jobs if job["applied"])
+    return "\n".join([
+        f"{name} replay benchmark, {int(server.latency * 1000)} ms latency",
+        f"  {len(jobs)} jobs, {applied} applied in {round(elapsed, 1)} s: "
+        f"{round(applied / elapsed * 60, 2) if elapsed else 0} applications/min",
+        f"  per job: p50 {round(percentile(seconds, 50), 2)} s, p95 {round(percentile(seconds, 95), 2)} s",
+        f"  WebDriver calls per job: {round(calls / len(jobs), 1) if jobs else 0} ({calls} in total)",
+        f"  replay server: {server.requests} requests, {server.misses} not recorded",
+    ] + ([format_report(webdriver)] if webdriver else []))
+
+
+def benchmark_linkedin(directory, latency: float, jitter: float, pacing: bool, workdir) -> str:
+    sys.path.insert(0, str(LINKEDIN_DIR))
+    from easyapplybot import EasyApplyBot
+
+    with ReplayServer(directory, latency=latency, jitter=jitter) as server:
+        # the positions and locations the recording was made with, from its search urls
+        positions, locations = [], []
+        for url in server.urls("search"):
+            query = parse_qs(urlsplit(url).query)
+            positions += [p for p in query.get("keywords", []) if p not in positions]
+            locations += [l for l in query.get("location", []) if l not in locations]
+
+        os.chdir(workdir)
+        bot = EasyApplyBot("replay", "replay", "0000000000", 0, 0, filename=str(Path(workdir) / "output.csv"),
+                           lean_browser=True, headless=True, session_cache=None,
+                           base_url=server.url, pacer=Pacer(enabled=pacing), webdriver_stats=True)
+        counter = bot.driver_stats
+        jobs = []
+        apply_to_job = bot.apply_to_job
+
+        def timed(jobID):
+            calls, start = counter.count, time.perf_counter()
+            applied = apply_to_job(jobID)
+            jobs.append({"seconds": time.perf_counter() - start, "calls": counter.count - calls, "applied": applied})
+            return applied
+
+        bot.apply_to_job = timed
+        start = time.perf_counter()
+        try:
+            bot.start_apply(positions, locations)
+        finally:
+            elapsed = time.perf_counter() - start
+            bot.browser.quit()
+        return summarize("LinkedIn", jobs, elapsed, server, counter.as_dict())
+
+
+def benchmark_naukri(directory, latency: float, jitter: float, pacing: bool, workdir) -> str:
+    with ReplayServer(directory, latency=latency, jitter=jitter) as server:
+        # /java-developer-jobs-in-bengaluru-2 -> role and location
+        searches = [urlsplit(url).path.strip("/") for url in server.urls("search")]
+        first = searches[0].rsplit("-jobs", 1) if searches else ["", ""]
+        role = first[0].replace("-", " ")
+        location = re.sub(r"-\d+$", "", first[1].removeprefix("-in-")).replace("-", " ") if len(first) > 1 else ""
+        config = {"email": "replay", "password": "replay", "role": role, "location": location,
+                  "max_pages": max(1, len(searches)), "max_applications": 1000,
+                  "base_url": server.url, "gemini": False, "lean_browser": True, "headless": True,
+                  "pacing": {"enabled": pacing}, "webdriver_stats": True}
+        sys.path.insert(0, str(NAUKRI_DIR))
+        from naukri_applier import run_session
+
+        os.chdir(workdir)
+        stats = run_session(config)
+        return summarize("Naukri", stats["jobs"], stats["elapsed"], server, stats.get("webdriver"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drive a bot against recorded pages and measure it")
+    parser.add_argument("bot", choices=["linkedin", "naukri"])
+    parser.add_argument("directory", help="directory written by the bot's --record")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+- seconds of random latency")
+    parser.add_argument("--no-pacing", action="store_true", help="skip the pacer's waits, to measure the bot alone")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    directory = os.path.abspath(args.directory)
+    # output files, logs and the results store of the run stay here for a look afterwards
+    workdir = tempfile.mkdtemp(prefix=f"benchmark-{args.bot}-")
+    run = benchmark_linkedin if args.bot == "linkedin" else benchmark_naukri
+    print(run(directory, args.latency, args.jitter, not args.no_pacing, workdir))
+    print(f"  run files in {workdir}")
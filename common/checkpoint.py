@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """Run state in a small json file, written atomically so a crash never leaves half a file.
+
+    save() is cheap to call often: unless forced it writes at most once per
+    `interval` seconds. The file is removed by clear() when a run finishes cleanly.
+    """
+
+    def __init__(self, path="checkpoint.json", interval: float = 10) -> None:
+        self.path = str(path)
+        self.interval = interval
+        self._last_save = 0.0
+        self._lock = threading.Lock()
+
+    def save(self, state: dict, force: bool = False) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_save < self.interval:
+                return False
+            tmp = self.path + ".tmp"
+            try:
+                with open(tmp, "w") as f:
+                    json.dump(dict(state, saved_at=time.time()), f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except Exception as e:
+                log.error(f"Could not write checkpoint {self.path}: {e}")
+                return False
+            self._last_save = now
+            return True
+
+    def load(self) -> dict | None:
+        if not os.path.isfile(self.path):
+            return None
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except Exception as e:
+            log.error(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in (self.path, self.path + ".tmp"):
+                if os.path.isfile(path):
+                    os.remove(path)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+CACHE_FILE = Path.home() / ".cache" / "jobapplierbot" / "chromedriver.json"
+
+_lock = threading.Lock()
+
+
+def chrome_version() -> str | None:
+    """Version of the locally installed Chrome, without starting it where possible."""
+    if sys.platform.startswith("win"):
+        try:
+            import winreg
+
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon") as key:
+                return winreg.QueryValueEx(key, "version")[0]
+        except Exception:
+            return None
+
+    if sys.platform == "darwin":
+        commands = [["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome", "--version"]]
+    else:
+        commands = [["google-chrome", "--version"], ["google-chrome-stable", "--version"],
+                    ["chromium", "--version"], ["chromium-browser", "--version"]]
+    for command in commands:
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, timeout=5).stdout
+        except Exception:
+            continue
+        match = re.search(r"(\d+\.\d+\.\d+\.\d+)", output)
+        if match:
+            return match.group(1)
+    return None
+
+
+def resolve_driver(cache_file=CACHE_FILE) -> str:
+    """Path of a chromedriver matching the local Chrome.
+
+    webdriver_manager (and its network lookups) only runs when the Chrome major
+    version changed or the cached binary is gone; otherwise the path recorded the
+    last time is reused. When the Chrome version cannot be read nothing is cached,
+    a path kept under an unknown version would outlive the next Chrome upgrade.
+    """
+    cache_file = Path(cache_file)
+    version = chrome_version()
+    if version is None:
+        log.info("Chrome version unknown, resolving chromedriver without the cache")
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        return ChromeDriverManager().install()
+
+    major = version.split(".")[0]
+    with _lock:
+        try:
+            cache = json.loads(cache_file.read_text())
+        except Exception:
+            cache = {}
+        path = cache.get(major)
+        if path and os.path.isfile(path):
+            return path
+
+        log.info(f"Resolving chromedriver for Chrome {major}")
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        path = ChromeDriverManager().install()
+        cache[major] = path
+        # written by earlier versions of this cache, never valid for long
+        cache.pop("unknown", None)
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(cache, indent=2))
+        except Exception as e:
+            log.debug(f"Could not write driver cache {cache_file}: {e}")
+        return path
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# urls the sites send a throttled or suspicious session to
+CHALLENGE_MARKERS = ("checkpoint/challenge", "/verify", "captcha", "authwall", "/uas/login")
+
+
+class Pacer:
+    """Every deliberate delay of a bot goes through here.
+
+    wait() takes a token before a page load; the bucket refills at `rate` per
+    second and holds up to `burst` tokens. sleep() is for the fixed pauses between
+    actions. Both are stretched by `slowdown`, which doubles on a challenge page,
+    a verify url or an empty result and creeps back down while responses are
+    clean, and both get some jitter so the timing never repeats exactly.
+    Thread safe, pooled bots can share one pacer. A disabled pacer never waits,
+    for benchmarks against the replay server.
+    """
+
+    def __init__(self, rate: float = 0.5, burst: int = 3, jitter: float = 0.3,
+                 min_slowdown: float = 0.5, max_slowdown: float = 16.0,
+                 backoff: float = 2.0, speedup: float = 0.9, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.min_slowdown = min_slowdown
+        self.max_slowdown = max_slowdown
+        self.backoff = backoff
+        self.speedup = speedup
+        self.slowdown = 1.0
+        self.tokens = float(burst)
+        self.waited = 0.0
+        self.backoffs = 0
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> Pacer:
+        return cls(**(config or {}))
+
+    def wait(self) -> float:
+        """Blocks until a page load is allowed."""
+        with self._lock:
+            now = time.monotonic()
+            rate = self.rate / self.slowdown
+            self.tokens = min(self.burst, self.tokens + (now - self._refilled) * rate)
+            self._refilled = now
+            # the token is taken now, a negative balance is the time owed
+            self.tokens -= 1
+            delay = max(0.0, -self.tokens / rate)
+        return self._sleep(self._jittered(delay) if delay else 0.0)
+
+    def sleep(self, seconds: float, adaptive: bool = True) -> float:
+        """A pause of nominally `seconds`; adaptive=False for waits on a human (2FA, CAPTCHA)."""
+        if adaptive:
+            with self._lock:
+                seconds *= self.slowdown
+            seconds = self._jittered(seconds)
+        return self._sleep(seconds)
+
+    def observe(self, url: str | None = None, empty: bool = False) -> bool:
+        """Feeds back what a page load returned; False when it looked throttled."""
+        url = (url or "").lower()
+        marker = next((m for m in CHALLENGE_MARKERS if m in url), None)
+        with self._lock:
+            if marker or empty:
+                self.slowdown = min(self.max_slowdown, self.slowdown * self.backoff)
+                self.tokens = min(self.tokens, 0.0)
+                self.backoffs += 1
+                log.info(f"Backing off ({marker or 'empty result'}), pacing {round(self.slowdown, 2)}x slower")
+                return False
+            self.slowdown = max(self.min_slowdown, self.slowdown * self.speedup)
+            return True
+
+    def report(self) -> str:
+        with self._lock:
+            return (f"Pacing: {round(self.waited)} s waited, backed off {self.backoffs} times, "
+                    f"ending at {round(self.slowdown, 2)}x")
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _sleep(self, seconds: float) -> float:
+        if seconds > 0 and self.enabled:
+            time.sleep(seconds)
+            with self._lock:
+                self.waited += seconds
+        return seconds
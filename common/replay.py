@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, parse_qsl, quote, unquote, urlencode, urlsplit
+
+log = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+
+# the sites' own scripts would call their live APIs (or redirect to a login), recorded pages are served static
+SCRIPT_TAG = re.compile(r"<script\b[^>]*>.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+
+# Injected into every replayed page. A click on anything but a form field or a link
+# swaps the body for the next recorded form step of that page, the way the Easy
+# Apply modal and the Naukri chatbot change in place. The listener is on the
+# document, so it survives the swap.
+STEP_SHIM = """
+<script>
+(function () {
+    var state = window.__replay;
+    document.addEventListener('click', function (event) {
+        var target = event.target;
+        if (!target || !target.closest) return;
+        if (target.closest('input, label, select, option, textarea')) return;
+        var link = target.closest('a[href]');
+        if (link && link.getAttribute('href').charAt(0) !== '#') return;
+        var next = state.step + 1;
+        fetch('/__replay/step?page=' + encodeURIComponent(state.page) + '&n=' + next)
+            .then(function (response) { return response.ok ? response.text() : null; })
+            .then(function (html) {
+                if (html === null) return;
+                state.step = next;
+                var doc = new DOMParser().parseFromString(html, 'text/html');
+                document.body.replaceWith(document.adoptNode(doc.body));
+            });
+    }, true);
+})();
+</script>
+"""
+
+# served for anything that was not recorded: logs in (both sites' login forms match it),
+# counts as logged in, and reads as an empty search result
+STUB_LOGIN = """<html><body>
+<form action="/feed/" method="get">
+<input id="username" name="u" placeholder="Enter Email ID / Username">
+<input id="password" name="p" type="password" placeholder="Enter Password">
+<button type="submit">Sign in</button> <button type="submit">Login</button>
+</form></body></html>"""
+STUB_EMPTY = """<html><body>
+<a href="/mnjuser/my-naukri">my-naukri</a>
+<div class="jobs-search-no-results-banner">Nothing recorded for this page</div>
+</body></html>"""
+
+
+def page_key(url: str) -> str:
+    """Path and query of a url in one canonical form, the trailing slash sites like to add dropped.
+
+    Percent-encoding is normalized and the query pairs are sorted, so
+    keywords=Software Engineer, keywords=Software+Engineer and
+    keywords=Software%20Engineer all give the same key.
+    """
+    parts = urlsplit(url)
+    path = quote(unquote(parts.path).rstrip("/") or "/")
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)), quote_via=quote)
+    return path + ("?" + query if query else "")
+
+
+def origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class PageRecorder:
+    """Saves the html of the pages a bot goes through, for the ReplayServer.
+
+    Pages are keyed by the url the bot asked for and the one it ended up on.
+    Form steps are numbered per page: step n is what the page looked like
+    after the n-th click on it.
+    """
+
+    def __init__(self, directory) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        try:
+            self.manifest = json.loads((self.directory / MANIFEST).read_text())
+        except Exception:
+            self.manifest = {"count": 0, "origins": [], "pages": {}, "steps": {}}
+
+    def record(self, driver, kind: str, url: str | None = None, step: int | None = None) -> None:
+        try:
+            current = driver.current_url
+            html = driver.page_source
+        except Exception as e:
+            log.debug(f"Could not record {kind} page: {e}")
+            return
+        url = url or current
+        with self._lock:
+            self.manifest["count"] += 1
+            name = f"{self.manifest['count']:05d}-{kind}.html"
+            (self.directory / name).write_text(html, encoding="utf-8")
+            for seen in {origin(url), origin(current)}:
+                if seen not in self.manifest["origins"]:
+                    self.manifest["origins"].append(seen)
+            if step is None:
+                for key in {page_key(url), page_key(current)}:
+                    self.manifest["pages"][key] = {"file": name, "kind": kind, "url": url}
+            else:
+                steps = self.manifest["steps"].setdefault(page_key(url), [])
+                del steps[step - 1:]
+                steps.extend([name] * (step - len(steps)))
+            tmp = self.directory / (MANIFEST + ".tmp")
+            tmp.write_text(json.dumps(self.manifest, indent=1))
+            os.replace(tmp, self.directory / MANIFEST)
+
+
+class ReplayServer:
+    """Serves a PageRecorder directory over http with an artificial latency per request.
+
+    Recorded absolute links are made relative, so point the bot's base url at
+    `url` and everything it navigates to stays on this server.
+    """
+
+    def __init__(self, directory, latency: float = 0.2, jitter: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0) -> None:
+        self.directory = Path(directory)
+        self.manifest = json.loads((self.directory / MANIFEST).read_text())
+        # recordings made before the keys were canonical still match
+        self.manifest["pages"] = {page_key(key): entry for key, entry in self.manifest["pages"].items()}
+        self.manifest["steps"] = {page_key(key): steps for key, steps in self.manifest["steps"].items()}
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._cache: dict = {}
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+        self._thread = None
+
+    def urls(self, kind: str) -> list:
+        """Urls the bot asked for when it recorded pages of one kind, in recording order."""
+        pages = sorted(self.manifest["pages"].values(), key=lambda page: page["file"])
+        return list(dict.fromkeys(page["url"] for page in pages if page["kind"] == kind))
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        log.info(f"Replaying {self.directory} on {self.url} with {int(self.latency * 1000)} ms latency")
+        return self.url
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> ReplayServer:
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def html(self, name: str) -> str:
+        if name not in self._cache:
+            html = (self.directory / name).read_text(encoding="utf-8")
+            html = SCRIPT_TAG.sub("", html)
+            for seen in self.manifest["origins"]:
+                html = html.replace(seen, "")
+            self._cache[name] = html
+        return self._cache[name]
+
+    def page(self, path: str) -> tuple:
+        """(status, html) for a request path."""
+        parts = urlsplit(path)
+        if parts.path == "/__replay/step":
+            query = parse_qs(parts.query)
+            steps = self.manifest["steps"].get(query.get("page", [""])[0], [])
+            n = int(query.get("n", ["0"])[0])
+            if 0 < n <= len(steps):
+                return 200, self.html(steps[n - 1])
+            return 404, ""
+        key = page_key(path)
+        entry = self.manifest["pages"].get(key)
+        if entry is None:
+            # the same page with a different query string, e.g. tracking parameters
+            bare = key.split("?")[0]
+            entry = next((e for k, e in self.manifest["pages"].items() if k.split("?")[0] == bare
+                          and e["kind"] != "search"), None)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return 200, STUB_LOGIN if parts.path.rstrip("/").endswith("login") else STUB_EMPTY
+        # form steps were recorded under the url the bot asked for
+        state = json.dumps({"page": page_key(entry["url"]), "step": 0})
+        return 200, self.html(entry["file"]) + f"<script>window.__replay = {state};</script>" + STEP_SHIM
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                self.respond(body=True)
+
+            def do_HEAD(self) -> None:
+                self.respond(body=False)
+
+            def respond(self, body: bool) -> None:
+                with server._lock:
+                    server.requests += 1
+                time.sleep(max(0.0, server.latency + random.uniform(-server.jitter, server.jitter)))
+                status, html = server.page(self.path)
+                data = html.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(data)
+
+            def log_message(self, format, *args) -> None:
+                log.debug("replay: " + format % args)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded LinkedIn / Naukri pages")
+    parser.add_argument("directory", help="directory written by --record")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+- seconds of random latency")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    server = ReplayServer(args.directory, latency=args.latency, jitter=args.jitter, port=args.port)
+    print(f"Serving {args.directory} on {server.url}, set the bot's base_url to it. Ctrl-C to stop.")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
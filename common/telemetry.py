@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import atexit
+import bisect
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# upper bounds in seconds, from a DOM probe to a whole application
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class _NullSpan:
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    def __init__(self, telemetry, name: str, attrs: dict) -> None:
+        self.telemetry = telemetry
+        self.name = name
+        self.attrs = attrs
+        self.id = next(telemetry._ids)
+        self.parent = None
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> Span:
+        stack = self.telemetry._stack()
+        self.parent = stack[-1].id if stack else None
+        stack.append(self)
+        self.started = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        seconds = time.perf_counter() - self._start
+        stack = self.telemetry._stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.telemetry._finish(self, seconds)
+
+
+class Telemetry:
+    """Nested timing spans and counters for one bot run.
+
+    Every span is written as one json line to `spans_file` (with its parent's id,
+    so the phases of a run nest) and feeds a latency histogram per span name.
+    Counters and histograms go to `metrics_file` in the Prometheus textfile
+    format, rewritten every `interval` seconds and at exit. With neither file
+    set telemetry is disabled and span() hands back a shared no-op object.
+    """
+
+    def __init__(self, spans_file=None, metrics_file=None, prefix: str = "jobbot", labels=None,
+                 interval: float = 15) -> None:
+        self.enabled = bool(spans_file or metrics_file)
+        self.metrics_file = metrics_file
+        self.prefix = prefix
+        self.labels = dict(labels or {})
+        self.interval = interval
+        self.counters: dict = {}  # (name, labels) -> value
+        self.histograms: dict = {}  # span name -> [bucket counts..., +Inf, sum, count]
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_write = time.monotonic()
+        self._spans = None
+        if spans_file:
+            os.makedirs(os.path.dirname(os.path.abspath(spans_file)), exist_ok=True)
+            self._spans = open(spans_file, "a", encoding="utf-8")
+        if self.enabled:
+            atexit.register(self.close)
+
+    @classmethod
+    def from_config(cls, config, **kwargs) -> Telemetry:
+        config = config or {}
+        return cls(config.get("spans"), config.get("metrics"), **kwargs)
+
+    def span(self, name: str, **attrs):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, attrs)
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _finish(self, span: Span, seconds: float) -> None:
+        with self._lock:
+            # one slot per bound plus +Inf, then sum and count
+            histogram = self.histograms.setdefault(span.name, [0] * (len(BUCKETS) + 3))
+            histogram[bisect.bisect_left(BUCKETS, seconds)] += 1
+            histogram[-2] += seconds
+            histogram[-1] += 1
+            if self._spans is not None:
+                record = {"span": span.name, "id": span.id, "parent": span.parent,
+                          "thread": threading.current_thread().name, "start": round(span.started, 3),
+                          "seconds": round(seconds, 4), **span.attrs}
+                self._spans.write(json.dumps(record, default=str) + "\n")
+            due = time.monotonic() - self._last_write >= self.interval
+        if due:
+            self.write_metrics()
+
+    def _labels(self, extra) -> str:
+        labels = {**self.labels, **dict(extra)}
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in labels.items()) + "}"
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name in sorted({name for name, _ in self.counters}):
+                lines.append(f"# TYPE {self.prefix}_{name}_total counter")
+                for (counter, labels), value in sorted(self.counters.items()):
+                    if counter == name:
+                        lines.append(f"{self.prefix}_{name}_total{self._labels(labels)} {value}")
+            if self.histograms:
+                metric = f"{self.prefix}_span_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                for name, histogram in sorted(self.histograms.items()):
+                    cumulative = 0
+                    for bound, bucket in zip(list(BUCKETS) + ["+Inf"], histogram):
+                        cumulative += bucket
+                        lines.append(f"{metric}_bucket{self._labels([('span', name), ('le', bound)])} {cumulative}")
+                    lines.append(f"{metric}_sum{self._labels([('span', name)])} {round(histogram[-2], 4)}")
+                    lines.append(f"{metric}_count{self._labels([('span', name)])} {histogram[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def write_metrics(self) -> None:
+        with self._lock:
+            self._last_write = time.monotonic()
+            if self._spans is not None:
+                self._spans.flush()
+        if not self.metrics_file:
+            return
+        # node_exporter may read the file at any moment, so it is replaced in one go
+        tmp = self.metrics_file + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.metrics_file)), exist_ok=True)
+            with open(tmp, "w") as f:
+                f.write(self.render())
+            os.replace(tmp, self.metrics_file)
+        except Exception as e:
+            log.error(f"Could not write metrics to {self.metrics_file}: {e}")
+
+    def close(self) -> None:
+        if not self.enabled:
+            return
+        self.write_metrics()
+        with self._lock:
+            if self._spans is not None:
+                self._spans.close()
+                self._spans = None
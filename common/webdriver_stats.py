@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# a full serialisation of the DOM, one of these in a loop is worth flagging on its own
+EXPENSIVE = {"getPageSource"}
+
+
+def _call_site() -> str:
+    # first frame outside selenium and this module: the bot line that caused the round trip
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if "selenium" not in filename and filename != __file__:
+            return f"{os.path.basename(filename)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "?"
+
+
+class CommandStats:
+    """Counts and times the WebDriver commands (http round trips) a driver sends.
+
+    Wraps the driver's execute in place; the elements it hands out go through
+    the same method, so .text, get_attribute and find_element on them are
+    counted too. Commands are kept by type and by the bot line that sent them.
+    begin()/end() bracket one application: a page source read twice from the
+    same line, or any command sent `loop_threshold` times from one line, within
+    an application is flagged as a round trip inside a loop.
+    """
+
+    def __init__(self, driver, loop_threshold: int = 10) -> None:
+        self.loop_threshold = loop_threshold
+        self.count = 0
+        self.seconds = 0.0
+        self.by_command: dict = {}  # command -> [count, seconds]
+        self.by_site: dict = {}  # (site, command) -> [count, seconds]
+        self.flagged: dict = {}  # (site, command) -> highest count within one application
+        self.applications = 0
+        self.application_calls = 0
+        self._window = None
+        self._lock = threading.Lock()
+        execute = driver.execute
+
+        def timed(command, params=None):
+            site = _call_site()
+            start = time.perf_counter()
+            try:
+                return execute(command, params)
+            finally:
+                self._add(command, site, time.perf_counter() - start)
+
+        driver.execute = timed
+
+    def _add(self, command: str, site: str, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            for table, key in ((self.by_command, command), (self.by_site, (site, command))):
+                entry = table.setdefault(key, [0, 0.0])
+                entry[0] += 1
+                entry[1] += seconds
+            window = self._window
+            if window is not None:
+                window["count"] += 1
+                window["seconds"] += seconds
+                window["commands"][command] += 1
+                window["sites"][(site, command)] += 1
+                repeats = window["sites"][(site, command)]
+                if repeats >= (2 if command in EXPENSIVE else self.loop_threshold):
+                    self.flagged[(site, command)] = max(repeats, self.flagged.get((site, command), 0))
+
+    def begin(self, label) -> None:
+        with self._lock:
+            self._window = {"label": label, "count": 0, "seconds": 0.0,
+                            "commands": Counter(), "sites": Counter()}
+
+    def end(self) -> str:
+        """One line on the application since begin()."""
+        with self._lock:
+            window, self._window = self._window, None
+            if window is None:
+                return ""
+            self.applications += 1
+            self.application_calls += window["count"]
+        top = ", ".join(f"{command} {count}" for command, count in window["commands"].most_common(4))
+        loops = [f"{command} x{count} at {site}" for (site, command), count in window["sites"].items()
+                 if count >= (2 if command in EXPENSIVE else self.loop_threshold)]
+        return (f"{window['label']}: {window['count']} WebDriver calls in {round(window['seconds'], 2)} s ({top})"
+                + (f", in a loop: {'; '.join(loops)}" if loops else ""))
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.count,
+                "seconds": round(self.seconds, 3),
+                "applications": self.applications,
+                "calls_per_application": round(self.application_calls / self.applications, 1) if self.applications else 0,
+                "commands": {command: {"calls": c, "seconds": round(s, 3)} for command, (c, s) in self.by_command.items()},
+                "sites": [{"site": site, "command": command, "calls": c, "seconds": round(s, 3)}
+                          for (site, command), (c, s) in self.by_site.items()],
+                "flagged": [{"site": site, "command": command, "calls": c} for (site, command), c in self.flagged.items()],
+            }
+
+    def report(self, top: int = 8) -> str:
+        return format_report(self.as_dict(), top=top)
+
+
+def format_report(stats: dict, top: int = 8) -> str:
+    """Run summary from CommandStats.as_dict(), also for stats read back from a file."""
+    lines = [f"WebDriver: {stats['calls']} calls, {stats['seconds']} s, "
+             f"{stats['calls_per_application']} per application over {stats['applications']} applications"]
+    commands = sorted(stats["commands"].items(), key=lambda item: -item[1]["seconds"])
+    lines += [f"  {command}: {entry['calls']} calls, {entry['seconds']} s" for command, entry in commands[:top]]
+    lines.append("  busiest call sites:")
+    sites = sorted(stats["sites"], key=lambda entry: -entry["seconds"])
+    lines += [f"    {entry['site']} {entry['command']}: {entry['calls']} calls, {entry['seconds']} s"
+              for entry in sites[:top]]
+    if stats["flagged"]:
+        lines.append("  round trips inside loops:")
+        lines += [f"    {entry['site']} {entry['command']}: up to {entry['calls']} per application"
+                  for entry in stats["flagged"]]
+    return "\n".join(lines)
@@ -0,0 +1,173 @@
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+# what apply_to_job returns -> outcome kept in the ledger
+OUTCOMES = {
+    "applied": "applied",
+    "already applied": "applied",
+    "company site": "ineligible",
+    "alert message": "ineligible",
+    "job container": "ineligible",
+    "not confirmed": "failed",
+    "failed": "failed",
+}
+
+# jobs with these outcomes are dropped from the search results on later runs
+FINAL = ("applied", "ineligible", "abandoned")
+
+# the job itself rules the bot out, another attempt would end the same way
+PERMANENT = {"company site", "alert message", "job container"}
+
+# exception in the chatbot loop -> failure category, anything else counts as "webdriver"
+ERROR_CATEGORIES = {
+    "TimeoutException": "timeout",
+    "StaleElementReferenceException": "stale element",
+    "ElementClickInterceptedException": "click intercepted",
+    "ElementNotInteractableException": "click intercepted",
+    "NoSuchElementException": "missing element",
+    "ValueError": "bad answer",
+    "IndexError": "bad answer",
+}
+
+# seconds a skip is taken to cost before there is any history to go by: page load + the 3 s settle
+DEFAULT_SKIP_SECONDS = 5.0
+
+
+def failure_category(reason, error=None) -> str:
+    if error is None:
+        return reason
+    return ERROR_CATEGORIES.get(type(error).__name__, "webdriver")
+
+
+def job_id(url) -> str:
+    # .../job-listings-java-developer-acme-bengaluru-3-to-5-years-150325500123?src=... -> 150325500123
+    path = urlsplit(url).path.rstrip("/")
+    match = re.search(r"-(\d+)$", path)
+    return match.group(1) if match else path
+
+
+class Ledger:
+    """SQLite record of every Naukri job the bot has opened, one row per job id.
+
+    Each row keeps the latest outcome (applied, ineligible or failed), the reason
+    behind it, when it happened, how long it took and how many attempts there
+    have been. Jobs that are applied to, ineligible or given up on are known before
+    their page is ever loaded, so the search stage can drop them.
+
+    Failed jobs go into a retry queue in the same file, with their failure
+    category and the time of the next attempt, backing off exponentially until
+    the attempts run out. Permanent failures are never queued.
+    """
+
+    def __init__(self, path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                url TEXT,
+                title TEXT,
+                company TEXT,
+                outcome TEXT NOT NULL,
+                reason TEXT,
+                timestamp REAL,
+                seconds REAL,
+                attempts INTEGER DEFAULT 1
+            );
+            CREATE TABLE IF NOT EXISTS retries (
+                job_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                category TEXT,
+                attempts INTEGER DEFAULT 0,
+                retry_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS retries_retry_at ON retries (retry_at);
+        """)
+        self._conn.commit()
+
+    def known(self, url):
+        """The reason a job needs no visit (already applied, company site, ...), None if it does.
+
+        Jobs waiting in the retry queue are known too, the queue gets to them when their backoff is over.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT reason FROM jobs WHERE job_id = ? AND outcome IN ({', '.join('?' * len(FINAL))}) "
+                "UNION ALL SELECT 'retry queued' FROM retries WHERE job_id = ? LIMIT 1",
+                (job_id(url), *FINAL, job_id(url))).fetchone()
+        return row[0] if row else None
+
+    def record(self, url, reason, seconds=0.0, title="", company="") -> None:
+        outcome = OUTCOMES.get(reason, "failed")
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, url, title, company, outcome, reason, timestamp, seconds) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (job_id) DO UPDATE SET url = excluded.url, "
+                "title = COALESCE(NULLIF(excluded.title, ''), title), "
+                "company = COALESCE(NULLIF(excluded.company, ''), company), "
+                "outcome = excluded.outcome, reason = excluded.reason, timestamp = excluded.timestamp, "
+                "seconds = excluded.seconds, attempts = attempts + 1",
+                (job_id(url), url, title, company, outcome, reason, time.time(), seconds))
+            self._conn.commit()
+
+    def schedule_retry(self, url, category, backoff=60.0, max_retries=3):
+        """Queues a failed job again, returns when it is due or None when it will not be retried."""
+        key = job_id(url)
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM retries WHERE job_id = ?", (key,)).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            if category in PERMANENT or attempts > max_retries:
+                self._conn.execute("DELETE FROM retries WHERE job_id = ?", (key,))
+                if category not in PERMANENT:
+                    self._conn.execute("UPDATE jobs SET outcome = 'abandoned', reason = ? WHERE job_id = ?",
+                                       (f"gave up after {category}", key))
+                self._conn.commit()
+                return None
+            retry_at = time.time() + backoff * 2 ** (attempts - 1)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO retries (job_id, url, category, attempts, retry_at) VALUES (?, ?, ?, ?, ?)",
+                (key, url, category, attempts, retry_at))
+            self._conn.commit()
+        return retry_at
+
+    def drop_retry(self, url) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM retries WHERE job_id = ?", (job_id(url),))
+            self._conn.commit()
+
+    def due_retries(self, now=None) -> list:
+        with self._lock:
+            rows = self._conn.execute("SELECT url FROM retries WHERE retry_at <= ? ORDER BY retry_at",
+                                      (now or time.time(),)).fetchall()
+        return [row[0] for row in rows]
+
+    def next_retry(self):
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(retry_at) FROM retries").fetchone()
+        return row[0]
+
+    def retry_counts(self) -> dict:
+        with self._lock:
+            return dict(self._conn.execute("SELECT category, COUNT(*) FROM retries GROUP BY category").fetchall())
+
+    def skip_seconds(self) -> float:
+        # what opening a job just to find it applied or ineligible has cost so far, on average
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT AVG(seconds) FROM jobs WHERE reason = 'already applied' OR outcome = 'ineligible'").fetchone()
+        return row[0] if row and row[0] else DEFAULT_SKIP_SECONDS
+
+    def counts(self) -> dict:
+        with self._lock:
+            return dict(self._conn.execute("SELECT outcome, COUNT(*) FROM jobs GROUP BY outcome").fetchall())
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
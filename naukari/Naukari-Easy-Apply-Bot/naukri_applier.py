@@ -0,0 +1,647 @@
+"""Naukri easy apply engine.
+
+NaukriApplier runs one session on a driver it is handed: login(), search(),
+apply() and report(), or run() for all of them. Nothing happens at import
+time and all state lives on the instance, so several appliers can run side by
+side in one process, and run_session() builds a complete session from a config
+dict for a process pool.
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# repository root, for the helpers shared with the LinkedIn bot
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from common.browser import block_resources, lean_options
+from common.checkpoint import Checkpoint
+from common.driver_cache import resolve_driver
+from common.pacing import Pacer
+from common.telemetry import Telemetry
+from common.webdriver_stats import CommandStats
+from ledger import OUTCOMES, Ledger, failure_category
+from page_scripts import HARVEST_TUPLES
+
+DEFAULT_BASE_URL = "https://www.naukri.com"
+
+SUCCESS_XPATH = "//span[contains(@class, 'apply-message') and contains(text(), 'successfully applied')]"
+TUPLE_SELECTOR = "div.srp-jobtuple-wrapper"
+NO_RESULTS_SELECTOR = ".no-result-container, .noResultContainer"
+SAVE_BUTTON_XPATH = "/html/body/div[2]/div/div[1]/div[3]/div/div"
+
+
+def chrome_options(config) -> Options:
+    options = Options()
+
+    # Use Chrome default profile (remove this if not needed)
+    # options.add_argument("user-data-dir=C:/Users/<you>/AppData/Local/Google/Chrome/User Data")
+    # options.add_argument("profile-directory=Default")  # Or "Profile 1", optional
+
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    # options.add_argument("--headless=new")  # Uncomment to run headless
+    options.add_argument("--window-size=1920,1080")
+
+    # Lean mode: headless, no images, fonts, media or trackers (same option set as the LinkedIn bot)
+    if config.get("lean_browser", False):
+        lean_options(options, headless=config.get("headless", True))
+    return options
+
+
+def make_driver(config):
+    # ChromeDriver, fetched once per Chrome version and then reused from the local cache
+    driver = webdriver.Chrome(service=Service(resolve_driver()), options=chrome_options(config))
+    if config.get("lean_browser", False):
+        block_resources(driver, config.get("blocked_urls"))
+    return driver
+
+
+class GeminiAnswerer:
+    """Answers chatbot questions with Gemini, the SDK is only imported once a question shows up."""
+
+    def __init__(self, telemetry=None) -> None:
+        self.telemetry = telemetry or Telemetry()
+
+    def __call__(self, question) -> str:
+        with self.telemetry.span("answer", source="gemini"):
+            from gemini_api import bard_flash_response
+            return bard_flash_response(question)
+
+
+def fixed_answer(question) -> str:
+    # first option / "1" for everything, for replays and benchmarks
+    return "1"
+
+
+class NaukriApplier:
+    """One Naukri session: search the role / location pages and apply to the jobs found.
+
+    config is the `naukri:` section of Config.yaml. The driver and the answerer
+    (question -> answer text) are passed in; pacer, telemetry, recorder,
+    checkpoint, driver_stats and ledger are optional and default to inactive ones.
+    """
+
+    def __init__(self, config, driver, answerer=None, pacer=None, telemetry=None, recorder=None,
+                 checkpoint=None, driver_stats=None, ledger=None) -> None:
+        self.config = config
+        self.email = config["email"]
+        self.password = config["password"]
+        self.role = config["role"]
+        self.location = config["location"]
+        self.max_pages = config["max_pages"]
+        self.max_applications = config["max_applications"]
+        # Point this at a replay server (python -m common.replay DIR) to run against recorded pages
+        self.base_url = config.get("base_url", DEFAULT_BASE_URL).rstrip("/")
+
+        self.driver = driver
+        self.wait = WebDriverWait(driver, 10)
+        # upper bound for the results page harvest, it returns as soon as the tuples have rendered
+        self.page_timeout = config.get("page_timeout", 10)
+        driver.set_script_timeout(self.page_timeout + 5)
+        self.telemetry = telemetry or Telemetry()
+        self.answerer = answerer or (GeminiAnswerer(self.telemetry) if config.get("gemini", True) else fixed_answer)
+        # Every deliberate wait goes through the pacer, it slows down on CAPTCHA pages and empty results
+        self.pacer = pacer or Pacer.from_config(config.get("pacing"))
+        self.recorder = recorder
+        self.checkpoint = checkpoint
+        self.driver_stats = driver_stats
+        self.ledger = ledger
+        self.ledger_skips = {}  # link -> reason, jobs the ledger ruled out before their page was opened
+        # failed jobs are retried retry_attempts times at most, after retry_backoff seconds and doubling from there
+        self.retry_attempts = config.get("retry_attempts", 3)
+        self.retry_backoff = config.get("retry_backoff", 60)
+        self.retry_wait = config.get("retry_wait", 300)
+        self.retried = 0
+        self.retry_failures = 0  # retries that failed again, counted apart from self.failed
+        self.error = None
+
+        self.applied = 0  # Count of jobs applied successfully
+        self.failed = 0   # Count of jobs failed
+        self.failed_job_links = []
+        self.job_links = []
+        self.job_cards = {}  # link -> title, company, experience and salary from the results page
+        # browser sessions loading result pages side by side, 1 searches page by page before applying
+        self.search_sessions = config.get("search_sessions", 1)
+        # how far a streamed search got, so a resumed run fetches only the pages it had not covered
+        self.search_finished = True
+        self.search_pages = 0
+        self.job_stats = []  # per job timings and WebDriver calls, with driver_stats
+        self.elapsed = 0.0
+
+    def snapshot(self, kind, url=None, step=None, driver=None) -> None:
+        # record mode only, a page_source read per page is too expensive otherwise
+        if self.recorder is not None:
+            self.recorder.record(driver or self.driver, kind, url=url, step=step)
+
+    def new_browser(self):
+        # a session of its own for the result fetcher, Naukri's result pages need no login
+        browser = make_driver(self.config)
+        browser.set_script_timeout(self.page_timeout + 5)
+        return browser
+
+    def save_checkpoint(self, index, force=False) -> None:
+        if self.checkpoint is not None:
+            self.checkpoint.save({"job_links": self.job_links, "index": index, "applied": self.applied,
+                                  "failed": self.failed, "failed_job_links": self.failed_job_links,
+                                  "search_finished": self.search_finished, "search_pages": self.search_pages},
+                                 force=force)
+
+    def login(self) -> None:
+        with self.telemetry.span("login"):
+            print("Logging into Naukri...")
+            self.driver.get(f"{self.base_url}/mnjuser/login")
+
+            try:
+                print("Waiting for email input...")
+                email_input = self.wait.until(EC.presence_of_element_located((By.XPATH, "//input[@placeholder='Enter Email ID / Username']")))
+                email_input.send_keys(self.email)
+                print("Entered email.")
+
+                password_input = self.wait.until(EC.presence_of_element_located((By.XPATH, "//input[@placeholder='Enter Password']")))
+                password_input.send_keys(self.password)
+                print("Entered password.")
+
+                login_button = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[text()='Login']")))
+                login_button.click()
+                print("Clicked login button.")
+
+                # Wait for a dashboard element that confirms successful login
+                self.wait.until(EC.presence_of_element_located((By.XPATH, "//a[contains(@href, 'my-naukri')]")))
+                print("Login successful.")
+
+            except Exception as e:
+                print(f"Login failed: {type(e).__name__}: {e}")
+                input("If there's a CAPTCHA or other blocker, solve it in the browser and press Enter to continue...")
+
+    def search_url(self, page) -> str:
+        search_url = f"{self.base_url}/{self.role.replace(' ', '-')}-jobs"
+        if self.location:
+            search_url += f"-in-{self.location.replace(' ', '-')}"
+        if page > 1:
+            search_url += f"-{page}"
+        return search_url
+
+    def harvest_page(self, search_url, driver=None) -> dict:
+        # one round trip per results page: waits until the tuples have rendered and reads them all
+        driver = driver or self.driver
+        with self.telemetry.span("search_page", url=search_url) as span:
+            self.pacer.wait()
+            driver.get(search_url)
+            result = driver.execute_async_script(HARVEST_TUPLES, TUPLE_SELECTOR, NO_RESULTS_SELECTOR,
+                                                      200, self.page_timeout * 1000)
+            span.set(status=result["status"], tuples=len(result["tuples"]), wait_ms=result["elapsed"])
+        return result
+
+    def known(self, link) -> bool:
+        # applied to or ineligible on an earlier run, no need to open the page again
+        if self.ledger is None:
+            return False
+        if link not in self.ledger_skips:
+            reason = self.ledger.known(link)
+            if reason is None:
+                return False
+            self.ledger_skips[link] = reason
+            self.telemetry.count("skipped", reason=f"ledger {reason}")
+        return True
+
+    def search(self) -> list:
+        """Search for job openings on Naukri.com and return job links"""
+        # ordered set: href -> {title, company, experience, salary}, first sighting wins
+        cards = {}
+        with self.telemetry.span("search", role=self.role, location=self.location) as span:
+            for page in range(1, self.max_pages + 1):
+                search_url = self.search_url(page)
+                print(f"\nSearching page {page}: {search_url}")
+                try:
+                    result = self.harvest_page(search_url)
+
+                    # Handle CAPTCHA if any
+                    if not self.pacer.observe(result["url"]):
+                        input("CAPTCHA detected — solve it manually, then press Enter to continue...")
+                        self.pacer.sleep(2, adaptive=False)
+                        result = self.harvest_page(search_url)
+                    self.snapshot("search", url=search_url)
+
+                    if not result["tuples"]:
+                        print(f"No job cards found ({result['status']}). Structure may have changed.")
+                        self.pacer.observe(empty=True)
+                        continue
+
+                    for card in result["tuples"]:
+                        link = card["href"]
+                        if link and "job-listings" in link and link not in cards and not self.known(link):
+                            cards[link] = card
+
+                    print(f"Found {len(result['tuples'])} jobs on page {page}")
+
+                except Exception as e:
+                    print(f" Error extracting jobs: {type(e).__name__}: {e}")
+                    self.pacer.observe(empty=True)
+
+                if len(cards) >= self.max_applications:
+                    print(f" Reached job link cap ({self.max_applications}).")
+                    break
+            span.set(jobs=len(cards))
+        self.job_cards.update(cards)
+        return list(cards)
+
+    def stream_links(self, first_page=1, links=()):
+        """Job links from a ResultFetcher, added to self.job_links as they are handed out.
+
+        A resumed run passes the links it had and the first page it had not covered:
+        those links come first, while the fetcher loads the remaining pages.
+        """
+        from result_fetcher import ResultFetcher
+
+        fetcher = ResultFetcher(self, workers=self.search_sessions, first_page=first_page, seen=links)
+        self.job_links = list(links)
+        self.search_finished = False
+        self.search_pages = fetcher.covered
+        fetcher.start()
+        try:
+            yield from links
+            for link in fetcher.links():
+                self.job_links.append(link)
+                self.job_cards[link] = fetcher.cards[link]
+                self.search_pages = fetcher.covered
+                yield link
+            self.search_finished = True
+            self.search_pages = fetcher.covered
+            print(f"Found {len(self.job_links)} jobs to apply for")
+        finally:
+            fetcher.stop()
+
+    def apply(self, job_links, start_index=0) -> None:
+        """job_links is a list, or a stream from stream_links() that is still being fetched"""
+        if isinstance(job_links, list):
+            self.job_links = job_links
+        for index, job_url in enumerate(job_links):
+            if index < start_index:
+                continue
+            if self.applied >= self.max_applications:
+                print(f"Reached maximum applications ({self.max_applications})")
+                break
+
+            # retries whose backoff ran out go in between the new jobs
+            self.retry_due()
+            if self.applied >= self.max_applications:
+                break
+
+            # this job is redone after a crash, Naukri reports it as already applied if it went through
+            self.save_checkpoint(index)
+            self.process(job_url)
+
+    def process(self, job_url, retry=False) -> str:
+        """apply_to_job plus the bookkeeping: stats, spans, the ledger and the retry queue."""
+        applied_before, calls, job_started = self.applied, self.driver_stats.count if self.driver_stats else 0, time.perf_counter()
+        if self.driver_stats is not None:
+            self.driver_stats.begin(job_url)
+        with self.telemetry.span("application", url=job_url, retry=retry) as span:
+            outcome = self.apply_to_job(job_url)
+            span.set(outcome=outcome)
+        self.telemetry.count("applications", outcome=outcome)
+        seconds = time.perf_counter() - job_started
+        retry_at = None
+        if self.ledger is not None:
+            card = self.job_cards.get(job_url, {})
+            self.ledger.record(job_url, outcome, seconds, title=card.get("title", ""), company=card.get("company", ""))
+            if OUTCOMES.get(outcome) == "failed":
+                category = failure_category(outcome, self.error)
+                retry_at = self.ledger.schedule_retry(job_url, category, self.retry_backoff, self.retry_attempts)
+                self.telemetry.count("failures", category=category)
+                if retry_at is None:
+                    print(f"Giving up on this job ({category})")
+                else:
+                    print(f"Queued for a retry in {round(retry_at - time.time())} s ({category})")
+            else:
+                self.ledger.drop_retry(job_url)
+        if retry and OUTCOMES.get(outcome) == "failed":
+            self.retry_failures += 1
+        # a job waiting in the retry queue has not failed yet, it counts once it is given up on
+        if outcome == "failed" and retry_at is None:
+            self.failed += 1
+        if self.driver_stats is not None:
+            print(self.driver_stats.end())
+            self.job_stats.append({"url": job_url, "seconds": seconds,
+                                   "calls": self.driver_stats.count - calls,
+                                   "applied": self.applied > applied_before})
+        return outcome
+
+    def retry_due(self) -> int:
+        """Applies again to the queued jobs whose backoff is over, returns how many were tried."""
+        if self.ledger is None:
+            return 0
+        tried = 0
+        for job_url in self.ledger.due_retries():
+            if self.applied >= self.max_applications:
+                break
+            print("\nRetrying a failed job")
+            self.telemetry.count("retries")
+            self.process(job_url, retry=True)
+            tried += 1
+        self.retried += tried
+        return tried
+
+    def retry_failed(self) -> None:
+        # end of the run: the queue gets its turn, waiting up to retry_wait seconds for a backoff to run out
+        while self.ledger is not None and self.applied < self.max_applications:
+            self.retry_due()
+            retry_at = self.ledger.next_retry()
+            if retry_at is None or retry_at - time.time() > self.retry_wait or not self.pacer.enabled:
+                break
+            self.pacer.sleep(max(0.0, retry_at - time.time()), adaptive=False)
+
+    def is_applied(self) -> bool:
+        return bool(self.driver.find_elements(By.XPATH, SUCCESS_XPATH))
+
+    def click_save(self, job_url, form_step) -> int:
+        with self.telemetry.span("form_step", step=form_step + 1):
+            save_button = self.wait.until(EC.element_to_be_clickable((By.XPATH, SAVE_BUTTON_XPATH)))
+            save_button.click()
+            self.pacer.sleep(1)
+        self.snapshot("form", url=job_url, step=form_step + 1)
+        return form_step + 1
+
+    def skip(self, job_url, reason) -> str:
+        self.telemetry.count("skipped", reason=reason)
+        self.failed += 1
+        self.failed_job_links.append(job_url)
+        return reason
+
+    def apply_to_job(self, job_url) -> str:
+        """Applies to one job, returns what happened: applied, a skip reason, not confirmed or failed."""
+        print(f"\nProcessing: {job_url}")
+        self.error = None  # what broke the chatbot loop, for the retry queue
+        with self.telemetry.span("job_page"):
+            self.pacer.wait()
+            self.driver.get(job_url)
+            self.pacer.sleep(3)
+        self.pacer.observe(self.driver.current_url)
+        self.snapshot("job", url=job_url)
+        form_step = 0
+
+        try:
+            # Check various job status indicators
+            if self.driver.find_elements(By.ID, "already-applied"):
+                print("Already applied to this position")
+                self.telemetry.count("skipped", reason="already applied")
+                return "already applied"
+
+            if self.driver.find_elements(By.XPATH, "//*[contains(@class, 'styles_alert-message-text__')]"):
+                print("Job has alert message - skipping")
+                return self.skip(job_url, "alert message")
+
+            if self.driver.find_elements(By.ID, "company-site-button"):
+                print("Application requires visiting company site - skipping")
+                return self.skip(job_url, "company site")
+
+            if self.driver.find_elements(By.CLASS_NAME, "jdContainer"):
+                print("Job container issue - skipping")
+                return self.skip(job_url, "job container")
+
+        except Exception as e:
+            print(f"Error checking job status: {e}")
+
+        try:
+            # Click the Apply button
+            apply_btn = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//*[text()='Apply']")))
+            apply_btn.click()
+            self.pacer.sleep(2)
+            form_step += 1
+            self.snapshot("form", url=job_url, step=form_step)
+
+            # Check if application was immediately successful
+            if self.is_applied():
+                print("Successfully applied.")
+                self.applied += 1
+                self.pacer.sleep(2)
+                return "applied"
+
+        except Exception as e:
+            print(f"Error during initial apply attempt: {e}")
+
+        # Handle application questions
+        outcome = "not confirmed"
+        while self.applied < self.max_applications:
+            try:
+                # Check for radio button questions
+                radio_buttons = self.driver.find_elements(By.CSS_SELECTOR, ".ssrc__radio-btn-container")
+                if radio_buttons:
+                    question = self.driver.find_element(By.XPATH, "//li[contains(@class, 'botItem')]/div/div/span").text
+                    print(question)
+
+                    options = []
+                    for number, button in enumerate(radio_buttons, start=1):
+                        label = button.find_element(By.CSS_SELECTOR, "label")
+                        value = button.find_element(By.CSS_SELECTOR, "input").get_attribute("value")
+                        options.append(f"{number}. {label.text} (Value: {value})")
+                        print(options[-1])
+
+                    options_str = "\n".join(options)
+                    selected_option = int(self.answerer(f"{question}\n{options_str}"))
+
+                    selected_button = radio_buttons[selected_option - 1].find_element(By.CSS_SELECTOR, "input")
+                    self.driver.execute_script("arguments[0].click();", selected_button)
+                    form_step = self.click_save(job_url, form_step)
+
+                    # Check for success after answering
+                    if self.is_applied():
+                        print("Successfully applied after question.")
+                        self.applied += 1
+                        outcome = "applied"
+                        break
+                    continue
+
+                # Check for text input questions
+                chat_list = self.driver.find_elements(By.XPATH, "//ul[contains(@id, 'chatList_')]")
+                if chat_list:
+                    li_elements = chat_list[0].find_elements(By.TAG_NAME, "li")
+                    last_question_text = li_elements[-1].text if li_elements else ""
+                    print("Last question text:", last_question_text)
+
+                    response = self.answerer(last_question_text)
+                    input_field = self.driver.find_element(By.XPATH, "//div[@class='textArea']")
+
+                    # Special handling for date fields
+                    if "Date of Birth" in last_question_text:
+                        dob_field = self.driver.find_element(By.XPATH, "//input[contains(@id, 'dob')]")
+                        dob_field.send_keys("01011990")
+                    elif response:
+                        input_field.send_keys(response)
+                    else:
+                        input_field.send_keys("None")
+
+                    self.pacer.sleep(1)
+                    form_step = self.click_save(job_url, form_step)
+
+                    # Check for success after answering
+                    if self.is_applied():
+                        print("Successfully applied after question.")
+                        self.applied += 1
+                        outcome = "applied"
+                        break
+                    continue
+
+                # Final success check
+                if self.is_applied():
+                    print("Application successful.")
+                    self.applied += 1
+                    outcome = "applied"
+                else:
+                    print("No more questions but application not confirmed")
+                break
+
+            except Exception as e:
+                print(f"Error during application process: {e}")
+                self.error = e
+                outcome = "failed"
+                break
+
+        # Add delay between applications
+        self.pacer.sleep(5)
+        return outcome
+
+    def summary(self) -> dict:
+        stats = {"applied": self.applied, "failed": self.failed, "jobs_found": len(self.job_links),
+                 "failed_job_links": self.failed_job_links, "elapsed": self.elapsed, "jobs": self.job_stats}
+        if self.ledger is not None:
+            stats["ledger_skips"] = len(self.ledger_skips)
+            stats["ledger_seconds_saved"] = round(self.seconds_saved(), 1)
+            stats["retried"] = self.retried
+            stats["retry_failures"] = self.retry_failures
+            stats["retry_queue"] = self.ledger.retry_counts()
+        if self.driver_stats is not None:
+            stats["webdriver"] = self.driver_stats.as_dict()
+        return stats
+
+    def ledger_report(self) -> str:
+        reasons = {}
+        for reason in self.ledger_skips.values():
+            reasons[reason] = reasons.get(reason, 0) + 1
+        details = ", ".join(f"{count} {reason}" for reason, count in sorted(reasons.items(), key=lambda item: -item[1]))
+        history = ", ".join(f"{count} {outcome}" for outcome, count in sorted(self.ledger.counts().items()))
+        queue = self.ledger.retry_counts()
+        return (f"Ledger: skipped {len(self.ledger_skips)} known jobs without opening them"
+                + (f" ({details}), about {round(self.seconds_saved())} s saved" if details else "")
+                + f"; {history or 'no jobs'} on record in {self.ledger.path}"
+                + f"\nRetries: {self.retried} this run, {self.retry_failures} failed again, {sum(queue.values())} still queued"
+                + (f" ({', '.join(f'{count} {category}' for category, count in sorted(queue.items()))})" if queue else ""))
+
+    def seconds_saved(self) -> float:
+        # queued retries are only put off, not saved
+        skipped = sum(1 for reason in self.ledger_skips.values() if reason != "retry queued")
+        return skipped * self.ledger.skip_seconds()
+
+    def report(self, failed_jobs_file="failed_jobs.txt") -> dict:
+        if self.driver_stats is not None:
+            print(self.driver_stats.report())
+
+        # Final report
+        print("\nApplication Summary:")
+        print(f"Successfully applied: {self.applied}")
+        print(f"Failed applications: {self.failed}")
+        print(f"Total jobs processed: {len(self.job_links)}")
+        if self.ledger is not None:
+            print(self.ledger_report())
+        print(self.pacer.report())
+
+        if self.failed_job_links and failed_jobs_file:
+            with open(failed_jobs_file, "w") as f:
+                f.write("\n".join(self.failed_job_links))
+            print(f"\n📝 Saved {len(self.failed_job_links)} failed job links to '{failed_jobs_file}'")
+        return self.summary()
+
+    def run(self, resume=False) -> dict:
+        self.login()
+        started = time.perf_counter()
+
+        state = self.checkpoint.load() if resume and self.checkpoint is not None else None
+        if state and state.get("job_links"):
+            # the pages already covered are not searched again, the run continues with the job it was on when it stopped
+            job_links = state["job_links"]
+            start_index = state.get("index", 0)
+            self.applied = state.get("applied", 0)
+            self.failed = state.get("failed", 0)
+            self.failed_job_links = state.get("failed_job_links", [])
+            print(f"Resuming at job {start_index + 1} of {len(job_links)} from {self.checkpoint.path}")
+            if not state.get("search_finished", True):
+                # a streamed search stopped part way: its links first, then the pages it had not covered
+                first_page = state.get("search_pages", 0) + 1
+                print(f"Fetching the search results again from page {first_page}")
+                stream = self.stream_links(first_page, job_links)
+                job_links = None
+                try:
+                    self.apply(stream, start_index)
+                finally:
+                    stream.close()
+        else:
+            if resume:
+                print("No checkpoint to resume from, starting a new search")
+            start_index = 0
+            if self.search_sessions > 1:
+                # the result pages load in their own sessions while the first jobs are applied to
+                job_links = None
+                stream = self.stream_links()
+                try:
+                    self.apply(stream, start_index)
+                finally:
+                    stream.close()
+            else:
+                job_links = self.search()
+                self.job_links = job_links
+                self.save_checkpoint(start_index, force=True)
+        if job_links is not None:
+            print(f"Found {len(job_links)} jobs to apply for")
+            self.apply(job_links, start_index)
+        self.retry_failed()
+        self.elapsed = time.perf_counter() - started
+        summary = self.report(self.config.get("failed_jobs", "failed_jobs.txt"))
+        self.telemetry.close()
+        # The run got to its end, nothing left to resume
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+        return summary
+
+
+def run_session(config, resume=False, record=None, stats=None) -> dict:
+    """A whole session from the `naukri:` config section: its own browser, run to the end.
+
+    Only plain data goes in and comes out, so it can be handed to a process pool.
+    """
+    driver = make_driver(config)
+    try:
+        recorder = None
+        if record:
+            from common.replay import PageRecorder
+            recorder = PageRecorder(record)
+        # Job links, failures and the position in the list, rewritten as the run goes so --resume can pick it up
+        checkpoint = Checkpoint(config.get("checkpoint", "checkpoint.json"), interval=config.get("checkpoint_interval", 10))
+        # Timing spans and counters, a no-op unless the config names a spans or metrics file
+        telemetry = Telemetry.from_config(config.get("telemetry"), labels={"bot": "naukri"})
+        # Every WebDriver round trip counted and timed by command and call site, with a summary per job and per run
+        driver_stats = CommandStats(driver) if stats or config.get("webdriver_stats", False) else None
+        # Outcome of every job opened on any run, applied and ineligible ones are dropped from later searches
+        ledger_path = config.get("ledger", "naukri_jobs.sqlite3")
+        ledger = Ledger(ledger_path) if ledger_path else None
+        applier = NaukriApplier(config, driver, telemetry=telemetry, recorder=recorder, checkpoint=checkpoint,
+                                driver_stats=driver_stats, ledger=ledger)
+        try:
+            summary = applier.run(resume=resume)
+        finally:
+            if ledger is not None:
+                ledger.close()
+        if stats:
+            with open(stats, "w") as f:
+                json.dump(summary, f, indent=1)
+        return summary
+    finally:
+        # Close the browser
+        driver.quit()
@@ -0,0 +1,48 @@
+# JavaScript snippets injected through execute_async_script.
+# Each one replaces a series of WebDriver round trips with a single call.
+
+# arguments: tuple selector, no results selector, quiet period (ms), timeout (ms), callback
+# Resolves once the job tuples have rendered (their count unchanged for the quiet
+# period) or, with no tuples on the page, it says there are no results; one record per tuple.
+HARVEST_TUPLES = """
+var tupleSelector = arguments[0], emptySelector = arguments[1], quietMs = arguments[2],
+    timeoutMs = arguments[3], done = arguments[arguments.length - 1];
+var start = performance.now(), lastCount = -1, lastChange = start;
+
+function text(tuple, selectors) {
+    for (var i = 0; i < selectors.length; i++) {
+        var el = tuple.querySelector(selectors[i]);
+        if (el && (el.title || el.innerText || '').trim()) return (el.title || el.innerText).trim();
+    }
+    return '';
+}
+function harvest(status) {
+    clearInterval(timer);
+    var tuples = [];
+    document.querySelectorAll(tupleSelector).forEach(function (tuple) {
+        var link = tuple.querySelector('a.title, a[class*="title"]');
+        tuples.push({
+            href: link ? link.href : '',
+            title: text(tuple, ['a.title', 'a[class*="title"]']),
+            company: text(tuple, ['a.comp-name', '.comp-name', '[class*="comp-name"]']),
+            experience: text(tuple, ['.expwdth', '.exp-wrap span', '[class*="exp"] span']),
+            salary: text(tuple, ['.sal-wrap span', '.sal span', '[class*="sal"] span'])
+        });
+    });
+    done({status: status, url: location.href, tuples: tuples,
+          elapsed: Math.round(performance.now() - start)});
+}
+var timer = setInterval(function () {
+    var now = performance.now();
+    if (now - start > timeoutMs) return harvest('timeout');
+    if (document.readyState === 'loading') return;
+    var count = document.querySelectorAll(tupleSelector).length;
+    if (!count && document.querySelector(emptySelector)) return harvest('empty');
+    if (count !== lastCount) {
+        lastCount = count;
+        lastChange = now;
+        return;
+    }
+    if (count > 0 && now - lastChange >= quietMs) harvest('ready');
+}, 50);
+"""
@@ -0,0 +1,142 @@
+import queue
+import threading
+
+
+class ResultFetcher:
+    """Loads the search result pages in several browser sessions at once.
+
+    The result urls are predictable (-jobs-in-<location>-<page>), so each worker
+    session takes the next page number and harvests it while the applier is busy
+    on its own browser. links() merges the pages back in page order, deduped,
+    and hands links out as soon as the pages before them are in. A CAPTCHA in
+    any session pauses every worker until it has been solved.
+
+    A resumed run starts at first_page, the first page it had not covered, and
+    passes the links it already has as seen so they are not handed out again.
+    """
+
+    def __init__(self, applier, workers: int = 3, first_page: int = 1, seen=()) -> None:
+        self.applier = applier
+        self.workers = max(1, workers)
+        self.first_page = first_page
+        self.pages: queue.Queue = queue.Queue()
+        for page in range(first_page, applier.max_pages + 1):
+            self.pages.put(page)
+        self.results: dict = {}  # page -> harvested tuples
+        self.last_page = applier.max_pages  # lowered when a page says there are no results
+        self.cards: dict = {link: {} for link in seen}  # ordered set of the links handed out, link -> tuple
+        self.covered = first_page - 1  # last page whose links have all been handed out
+        self._done = threading.Condition()
+        self._running = threading.Event()
+        self._running.set()
+        self._stop_event = threading.Event()
+        self._challenge = threading.Lock()
+        self._solved = 0
+        self._threads: list = []
+        self._browsers: list = []
+
+    def start(self) -> None:
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"result-fetcher-{number + 1}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _work(self) -> None:
+        browser = None
+        try:
+            browser = self.applier.new_browser()
+            self._browsers.append(browser)
+            while not self._stop_event.is_set():
+                try:
+                    page = self.pages.get_nowait()
+                except queue.Empty:
+                    return
+                if page > self.last_page:
+                    continue
+                self._finish(page, *self._fetch(browser, page))
+        except Exception as e:
+            print(f"Result fetcher stopped: {type(e).__name__}: {e}")
+        finally:
+            with self._done:
+                self._done.notify_all()
+
+    def _fetch(self, browser, page, tries: int = 2) -> tuple:
+        """(tuples, empty): empty only when Naukri said there are no results, not on an error or timeout."""
+        search_url = self.applier.search_url(page)
+        print(f"\nSearching page {page}: {search_url}")
+        for attempt in range(1, tries + 1):
+            try:
+                while True:
+                    self._running.wait()
+                    solved = self._solved
+                    result = self.applier.harvest_page(search_url, driver=browser)
+                    if self.applier.pacer.observe(result["url"]):
+                        break
+                    self._pause(solved)
+                self.applier.snapshot("search", url=search_url, driver=browser)
+                if result["tuples"]:
+                    print(f"Found {len(result['tuples'])} jobs on page {page}")
+                    return result["tuples"], False
+                print(f"No job cards found on page {page} ({result['status']})")
+                self.applier.pacer.observe(empty=True)
+                if result["status"] == "empty":
+                    return [], True
+            except Exception as e:
+                print(f" Error extracting jobs from page {page}: {type(e).__name__}: {e}")
+                self.applier.pacer.observe(empty=True)
+        # one retry, then just this page is skipped, like the page by page search does
+        return [], False
+
+    def _pause(self, solved) -> None:
+        # one prompt for all sessions, whoever hit the CAPTCHA while it was up just loads again
+        with self._challenge:
+            if self._solved != solved:
+                return
+            self._running.clear()
+            try:
+                input("CAPTCHA detected — solve it manually in the search browsers, then press Enter to continue...")
+                self.applier.pacer.sleep(2, adaptive=False)
+            finally:
+                self._solved += 1
+                self._running.set()
+
+    def _finish(self, page, tuples, empty) -> None:
+        with self._done:
+            self.results[page] = tuples
+            if empty:
+                # no results here, so no later page has any either
+                self.last_page = min(self.last_page, page)
+            self._done.notify_all()
+
+    def links(self):
+        """Job links in page order, deduped, as the pages come in."""
+        page = self.first_page
+        while page <= self.last_page:
+            with self._done:
+                while page not in self.results and page <= self.last_page:
+                    if not any(thread.is_alive() for thread in self._threads):
+                        return
+                    self._done.wait(timeout=1)
+                tuples = self.results.pop(page, [])
+            for card in tuples:
+                link = card["href"]
+                if link and "job-listings" in link and link not in self.cards and not self.applier.known(link):
+                    self.cards[link] = card
+                    yield link
+            self.covered = page
+            if len(self.cards) >= self.applier.max_applications:
+                print(f" Reached job link cap ({self.applier.max_applications}).")
+                return
+            page += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._running.set()
+        for thread in self._threads:
+            thread.join(timeout=10)
+        for browser in self._browsers:
+            try:
+                browser.quit()
+            except Exception:
+                pass
+        self._browsers = []